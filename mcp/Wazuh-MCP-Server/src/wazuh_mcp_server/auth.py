@@ -10,13 +10,15 @@ import json
 import logging
 import os
 import secrets
-from dataclasses import dataclass
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
+import jwt
 from fastapi import Header, HTTPException
-from jose import jwt
-from jose.exceptions import ExpiredSignatureError, JWTError
 from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
@@ -45,6 +47,74 @@ class AuthToken:
             return True  # No scopes means full access
         return scope in self.scopes
 
+    def copy(self) -> "AuthToken":
+        """Return a copy whose scopes and metadata can be changed independently."""
+        return replace(
+            self,
+            scopes=None if self.scopes is None else list(self.scopes),
+            metadata=None if self.metadata is None else dict(self.metadata),
+        )
+
+
+class VerifiedTokenCache:
+    """Bounded cache of successfully verified tokens.
+
+    Entries are keyed by the SHA-256 digest of the raw token, so the tokens
+    themselves are never held in memory. An entry lives for at most ttl seconds
+    and never past the token's own expiry; the least recently used entry is
+    evicted at maxsize. Failed verifications are not cached.
+    """
+
+    def __init__(self, ttl: float = 30.0, maxsize: int = 10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Any]:
+        """Return the cached value for token, or None if absent or stale."""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[0]:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, token: str, value: Any, expires_at: Optional[float] = None) -> None:
+        """Cache value for token; expires_at is the token's exp as a Unix timestamp."""
+        lifetime = self.ttl
+        if expires_at is not None:
+            lifetime = min(lifetime, expires_at - time.time())
+        if lifetime <= 0:
+            return
+
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + lifetime, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def create_token_cache() -> VerifiedTokenCache:
+    """Create a verified-token cache sized from MCP_JWT_CACHE_TTL / MCP_JWT_CACHE_SIZE."""
+    return VerifiedTokenCache(
+        ttl=float(os.getenv("MCP_JWT_CACHE_TTL", "30")),
+        maxsize=int(os.getenv("MCP_JWT_CACHE_SIZE", "10000")),
+    )
+
 
 class APIKey(BaseModel):
     """API Key model."""
@@ -267,6 +337,9 @@ class AuthManager:
 # Global auth manager instance
 auth_manager = AuthManager()
 
+# JWTs cannot be revoked, so a successful verification can be reused until expiry
+jwt_cache = create_token_cache()
+
 
 class TokenRequest(BaseModel):
     """Token request model."""
@@ -312,6 +385,11 @@ async def verify_bearer_token(authorization: str) -> AuthToken:
         raise ValueError("Invalid or expired session token")
 
     # Second, try JWT token validation (tokens from /auth/token endpoint)
+    cached = jwt_cache.get(token)
+    if cached is not None:
+        # Callers own the returned token; never hand out the shared cached instance
+        return cached.copy()
+
     try:
         # Import config to get the same secret key used for token creation
         from wazuh_mcp_server.config import get_config
@@ -339,7 +417,7 @@ async def verify_bearer_token(authorization: str) -> AuthToken:
         scopes = scope_string.split() if scope_string else ["wazuh:read", "wazuh:write"]
 
         # Create AuthToken object from JWT payload
-        return AuthToken(
+        token_obj = AuthToken(
             token=token,
             api_key_id="jwt_auth",
             created_at=created_at,
@@ -347,6 +425,8 @@ async def verify_bearer_token(authorization: str) -> AuthToken:
             scopes=scopes,
             metadata={"sub": payload.get("sub"), "token_type": "jwt"},
         )
+        jwt_cache.put(token, token_obj.copy(), exp_timestamp)
+        return token_obj
 
     except ValueError:
         # JWT validation failed
@@ -375,9 +455,9 @@ def verify_token(token: str, secret_key: str) -> Dict[str, Any]:
     try:
         payload = jwt.decode(token, secret_key, algorithms=["HS256"])
         return payload
-    except ExpiredSignatureError:
+    except jwt.ExpiredSignatureError:
         raise ValueError("Token has expired")
-    except JWTError:
+    except jwt.PyJWTError:
         raise ValueError("Invalid token")
 
 
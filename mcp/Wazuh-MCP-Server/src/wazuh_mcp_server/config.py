@@ -177,6 +177,8 @@ class ServerConfig:
     OAUTH_ACCESS_TOKEN_TTL: int = 3600  # 1 hour
     OAUTH_REFRESH_TOKEN_TTL: int = 86400  # 24 hours
     OAUTH_AUTHORIZATION_CODE_TTL: int = 600  # 10 minutes
+    OAUTH_MAX_AUTHORIZATION_CODES: int = 10000  # Oldest codes evicted beyond this
+    OAUTH_MAX_REFRESH_TOKENS: int = 100000  # Oldest refresh tokens evicted beyond this
 
     # CORS settings
     ALLOWED_ORIGINS: str = "https://claude.ai,http://localhost:*"
@@ -238,6 +240,12 @@ class ServerConfig:
             OAUTH_AUTHORIZATION_CODE_TTL=validate_positive_int(
                 os.getenv("OAUTH_AUTHORIZATION_CODE_TTL", "600"), "OAUTH_AUTHORIZATION_CODE_TTL"
             ),
+            OAUTH_MAX_AUTHORIZATION_CODES=validate_positive_int(
+                os.getenv("OAUTH_MAX_AUTHORIZATION_CODES", "10000"), "OAUTH_MAX_AUTHORIZATION_CODES"
+            ),
+            OAUTH_MAX_REFRESH_TOKENS=validate_positive_int(
+                os.getenv("OAUTH_MAX_REFRESH_TOKENS", "100000"), "OAUTH_MAX_REFRESH_TOKENS"
+            ),
             ALLOWED_ORIGINS=os.getenv("ALLOWED_ORIGINS", "https://claude.ai,http://localhost:*"),
             WAZUH_HOST=normalize_host(os.getenv("WAZUH_HOST", "")),
             WAZUH_USER=os.getenv("WAZUH_USER", ""),
@@ -8,13 +8,13 @@ import asyncio
 import contextvars
 import logging
 import os
+import secrets
 import sys
 import time
-import uuid
 from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import psutil
 from fastapi import Request
@@ -31,12 +31,12 @@ correlation_id_var: contextvars.ContextVar[str] = contextvars.ContextVar("correl
 
 def get_correlation_id() -> str:
     """Get the current correlation ID from context."""
-    return correlation_id_var.get() or str(uuid.uuid4())[:8]
+    return correlation_id_var.get() or secrets.token_hex(4)
 
 
 def set_correlation_id(correlation_id: Optional[str] = None) -> str:
     """Set correlation ID in context. Generates one if not provided."""
-    cid = correlation_id or str(uuid.uuid4())[:8]
+    cid = correlation_id or secrets.token_hex(4)
     correlation_id_var.set(cid)
     return cid
 
@@ -157,13 +157,16 @@ class HealthChecker:
     """Comprehensive health checking system."""
 
     def __init__(self):
-        self.checks: Dict[str, callable] = {}
+        self.checks: Dict[str, Callable] = {}
+        # Snapshot of self.checks as (name, func) pairs for run_all_checks()
+        self._ordered: Tuple[Tuple[str, Callable], ...] = ()
         self.last_results: Dict[str, HealthCheckResult] = {}
         self.check_timeout = 5.0  # seconds
 
-    def register_check(self, name: str, check_func: callable):
+    def register_check(self, name: str, check_func: Callable):
         """Register a health check function."""
         self.checks[name] = check_func
+        self._ordered = tuple(self.checks.items())
 
     async def run_check(self, name: str) -> HealthCheckResult:
         """Run a single health check."""
@@ -175,12 +178,15 @@ class HealthChecker:
                 duration_ms=0,
                 timestamp=datetime.now(timezone.utc),
             )
+        return await self._run_check_func(name, self.checks[name])
 
-        start_time = time.time()
+    async def _run_check_func(self, name: str, check_func: Callable) -> HealthCheckResult:
+        """Run an already resolved health check function."""
+        start_time = time.perf_counter()
         try:
-            result = await asyncio.wait_for(self.checks[name](), timeout=self.check_timeout)
+            result = await asyncio.wait_for(check_func(), timeout=self.check_timeout)
 
-            duration_ms = (time.time() - start_time) * 1000
+            duration_ms = (time.perf_counter() - start_time) * 1000
 
             if isinstance(result, dict):
                 status = result.get("status", "healthy")
@@ -201,7 +207,7 @@ class HealthChecker:
             )
 
         except asyncio.TimeoutError:
-            duration_ms = (time.time() - start_time) * 1000
+            duration_ms = (time.perf_counter() - start_time) * 1000
             return HealthCheckResult(
                 name=name,
                 status="unhealthy",
@@ -210,7 +216,7 @@ class HealthChecker:
                 timestamp=datetime.now(timezone.utc),
             )
         except Exception as e:
-            duration_ms = (time.time() - start_time) * 1000
+            duration_ms = (time.perf_counter() - start_time) * 1000
             return HealthCheckResult(
                 name=name,
                 status="unhealthy",
@@ -221,23 +227,13 @@ class HealthChecker:
 
     async def run_all_checks(self) -> Dict[str, HealthCheckResult]:
         """Run all registered health checks."""
-        tasks = [self.run_check(name) for name in self.checks.keys()]
-
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        health_results = {}
-        for i, (name, result) in enumerate(zip(self.checks.keys(), results)):
-            if isinstance(result, Exception):
-                health_results[name] = HealthCheckResult(
-                    name=name,
-                    status="unhealthy",
-                    message=f"Check execution failed: {str(result)}",
-                    duration_ms=0,
-                    timestamp=datetime.now(timezone.utc),
-                )
-            else:
-                health_results[name] = result
+        # _run_check_func() converts every failure into an unhealthy result,
+        # so no exception can escape into gather() here.
+        ordered = self._ordered
+        names = tuple(name for name, _ in ordered)
+        results = await asyncio.gather(*(self._run_check_func(name, func) for name, func in ordered))
 
+        health_results = dict(zip(names, results))
         self.last_results = health_results
         return health_results
 
@@ -249,6 +245,9 @@ class MetricsCollector:
         self.collection_interval = 30  # seconds
         self.last_collection = 0
         self._collection_task = None
+        # One Process handle for the lifetime of the server; also keeps
+        # cpu_percent() meaningful since it measures since the previous call.
+        self._proc = psutil.Process()
 
     async def start_collection(self):
         """Start metrics collection task."""
@@ -281,7 +280,7 @@ class MetricsCollector:
         """Collect system-level metrics."""
         try:
             # Memory usage
-            process = psutil.Process()
+            process = self._proc
             memory_info = process.memory_info()
             SYSTEM_MEMORY_USAGE.set(memory_info.rss)
 
@@ -359,9 +358,15 @@ class PerformanceProfiler:
         self.slow_requests: deque = deque(maxlen=100)
         self.slow_threshold = 1.0  # seconds
 
-    def record_request(self, method: str, path: str, duration: float, status_code: int):
-        """Record request performance."""
-        if duration > self.slow_threshold:
+    def record_request(self, method: str, path: str, duration: float, status_code: int, is_slow: Optional[bool] = None):
+        """Record request performance.
+
+        Callers that have already compared ``duration`` against ``slow_threshold``
+        can pass the outcome as ``is_slow`` to skip the second comparison.
+        """
+        if is_slow is None:
+            is_slow = duration > self.slow_threshold
+        if is_slow:
             self.slow_requests.append(
                 {
                     "method": method,
@@ -384,34 +389,32 @@ alert_manager = AlertManager()
 performance_profiler = PerformanceProfiler()
 
 
+# Memory limit for the health check, read once at import time
+_MAX_MEMORY_MB = max(1, int(os.getenv("MAX_MEMORY_MB", "512")))  # Prevent division by zero
+_MAX_MEMORY_BYTES = _MAX_MEMORY_MB * 1024 * 1024
+_MEMORY_CRITICAL_BYTES = _MAX_MEMORY_BYTES * 0.9
+_MEMORY_HIGH_BYTES = _MAX_MEMORY_BYTES * 0.8
+
+
 # Register default health checks
 async def check_memory_usage():
     """Check memory usage."""
     try:
-        process = psutil.Process()
-        memory_mb = process.memory_info().rss / 1024 / 1024
-        max_memory_mb = max(1, int(os.getenv("MAX_MEMORY_MB", "512")))  # Prevent division by zero
-
-        usage_percent = (memory_mb / max_memory_mb) * 100
+        rss = metrics_collector._proc.memory_info().rss
 
-        if usage_percent > 90:
-            return {
-                "status": "unhealthy",
-                "message": f"Memory usage critical: {usage_percent:.1f}%",
-                "details": {"memory_mb": memory_mb, "max_memory_mb": max_memory_mb},
-            }
-        elif usage_percent > 80:
-            return {
-                "status": "degraded",
-                "message": f"Memory usage high: {usage_percent:.1f}%",
-                "details": {"memory_mb": memory_mb, "max_memory_mb": max_memory_mb},
-            }
+        if rss > _MEMORY_CRITICAL_BYTES:
+            status, label = "unhealthy", "critical"
+        elif rss > _MEMORY_HIGH_BYTES:
+            status, label = "degraded", "high"
         else:
-            return {
-                "status": "healthy",
-                "message": f"Memory usage normal: {usage_percent:.1f}%",
-                "details": {"memory_mb": memory_mb, "max_memory_mb": max_memory_mb},
-            }
+            status, label = "healthy", "normal"
+
+        usage_percent = rss / _MAX_MEMORY_BYTES * 100
+        return {
+            "status": status,
+            "message": f"Memory usage {label}: {usage_percent:.1f}%",
+            "details": {"memory_mb": rss / 1024 / 1024, "max_memory_mb": _MAX_MEMORY_MB},
+        }
     except Exception as e:
         return {"status": "unhealthy", "message": f"Memory check failed: {str(e)}"}
 
@@ -424,9 +427,9 @@ async def check_wazuh_connectivity():
         client = await get_wazuh_client()
 
         # Simple health check call
-        start_time = time.time()
+        start_time = time.perf_counter()
         response = await client.get_manager_info()
-        duration_ms = (time.time() - start_time) * 1000
+        duration_ms = (time.perf_counter() - start_time) * 1000
 
         if response and "data" in response:
             return {
@@ -495,11 +498,12 @@ async def check_circuit_breaker() -> Dict[str, Any]:
         client = await get_wazuh_client()
         if hasattr(client, "_circuit_breaker"):
             cb = client._circuit_breaker
-            state = cb._state if hasattr(cb, "_state") else "unknown"
+            cb_state = getattr(cb, "state", None)
+            state = cb_state.name.lower() if cb_state is not None else "unknown"
             failure_count = cb.failure_count if hasattr(cb, "failure_count") else 0
 
-            # Update Prometheus metric
-            state_value = {"closed": 0, "open": 1, "half_open": 2}.get(state, -1)
+            # Update Prometheus metric (state values are 0=closed, 1=open, 2=half_open)
+            state_value = int(cb_state) if cb_state is not None else -1
             CIRCUIT_BREAKER_STATE.labels(service="wazuh_api").set(state_value)
 
             if state == "open":
@@ -546,28 +550,63 @@ async def metrics_endpoint() -> PlainTextResponse:
     return PlainTextResponse(generate_latest(REGISTRY), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 
+# Single-flight state for health_endpoint: concurrent scrapes share one
+# evaluation, and a result is reused for HEALTH_CACHE_TTL seconds.
+HEALTH_CACHE_TTL = 1.0  # seconds
+_health_inflight: Optional[asyncio.Task] = None
+_health_cache: Tuple[float, Dict[str, Any]] = (0.0, {})
+
+
 async def health_endpoint() -> Dict[str, Any]:
     """Comprehensive health check endpoint."""
+    global _health_inflight, _health_cache
+
+    cached_at, cached = _health_cache
+    if cached and time.monotonic() - cached_at < HEALTH_CACHE_TTL:
+        return cached
+
+    task = _health_inflight
+    if task is None:
+        task = _health_inflight = asyncio.create_task(_evaluate_health())
+        task.add_done_callback(_clear_health_inflight)
+
+    # Shield so one cancelled caller does not abort the shared evaluation
+    return await asyncio.shield(task)
+
+
+def _clear_health_inflight(task: asyncio.Task) -> None:
+    """Publish a finished health evaluation and release the in-flight slot."""
+    global _health_inflight, _health_cache
+
+    if _health_inflight is task:
+        _health_inflight = None
+    if not task.cancelled() and task.exception() is None:
+        _health_cache = (time.monotonic(), task.result())
+
+
+async def _evaluate_health() -> Dict[str, Any]:
+    """Run all health checks and build the health response."""
     results = await health_checker.run_all_checks()
 
     overall_status = "healthy"
-    if any(r.status == "unhealthy" for r in results.values()):
-        overall_status = "unhealthy"
-    elif any(r.status == "degraded" for r in results.values()):
-        overall_status = "degraded"
+    checks = {}
+    for name, result in results.items():
+        status = result.status
+        if status == "unhealthy":
+            overall_status = "unhealthy"
+        elif status == "degraded" and overall_status == "healthy":
+            overall_status = "degraded"
+        checks[name] = {
+            "status": status,
+            "message": result.message,
+            "duration_ms": result.duration_ms,
+            "details": result.details,
+        }
 
     return {
         "status": overall_status,
         "timestamp": datetime.now(timezone.utc).isoformat(),
-        "checks": {
-            name: {
-                "status": result.status,
-                "message": result.message,
-                "duration_ms": result.duration_ms,
-                "details": result.details,
-            }
-            for name, result in results.items()
-        },
+        "checks": checks,
     }
 
 
@@ -581,7 +620,7 @@ def setup_monitoring_middleware():
         correlation_id = set_correlation_id(correlation_id)
 
         # Record request start
-        start_time = time.time()
+        start_time = time.perf_counter()
         method = request.method
         path = request.url.path
 
@@ -606,13 +645,14 @@ def setup_monitoring_middleware():
             raise
         finally:
             # Record metrics
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
 
             REQUEST_COUNT.labels(method=method, endpoint=path, status_code=status_code).inc()
             REQUEST_DURATION.labels(method=method, endpoint=path).observe(duration)
 
             # Record slow requests with correlation ID
-            if duration > performance_profiler.slow_threshold:
+            is_slow = duration > performance_profiler.slow_threshold
+            if is_slow:
                 structured_logger.warning(
                     f"Slow request detected: {method} {path}",
                     duration_seconds=duration,
@@ -621,7 +661,7 @@ def setup_monitoring_middleware():
                     path=path,
                 )
 
-            performance_profiler.record_request(method, path, duration, status_code)
+            performance_profiler.record_request(method, path, duration, status_code, is_slow)
 
         return response
 
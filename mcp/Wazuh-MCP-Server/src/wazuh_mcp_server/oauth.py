@@ -5,20 +5,111 @@ Implements MCP 2025-11-25 authentication specification for Claude Desktop integr
 """
 
 import hashlib
+import hmac
+import json
 import logging
 import secrets
+from binascii import a2b_base64, b2a_base64
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
-from urllib.parse import urlencode
+from functools import lru_cache
+from os import urandom
+from time import time as _time
+from typing import Any, Dict, FrozenSet, List, Optional
+from urllib.parse import quote_plus
 
 from fastapi import APIRouter, Form, Query, Request
 from fastapi.responses import JSONResponse, RedirectResponse
-from jose import jwt
-from jose.exceptions import JWTError
+
+from wazuh_mcp_server.auth import create_token_cache
 
 logger = logging.getLogger(__name__)
 
+# Standard <-> URL-safe base64 alphabet (RFC 4648 section 5)
+_B64_TRANS = bytes.maketrans(b"+/", b"-_")
+_B64_UNTRANS = bytes.maketrans(b"-_", b"+/")
+
+
+def _b64url_encode(data: bytes) -> bytes:
+    """Unpadded URL-safe base64, as used by JWT and PKCE."""
+    return b2a_base64(data, newline=False).translate(_B64_TRANS).rstrip(b"=")
+
+
+def _b64url_decode(data: bytes) -> bytes:
+    """Decode unpadded URL-safe base64."""
+    return a2b_base64(data.translate(_B64_UNTRANS) + b"=" * (-len(data) % 4))
+
+
+# Every OAuth JWT is minted with this exact header
+_HS256_HEADER_B64 = _b64url_encode(b'{"alg":"HS256","typ":"JWT"}')
+
+
+def _sign_hs256(payload: Dict[str, Any], signer: "hmac.HMAC") -> str:
+    """Encode payload as a compact HS256 JWT.
+
+    signer is an HMAC-SHA256 object already keyed with the secret; it is
+    copied per call so the key schedule is not recomputed.
+    """
+    signing_input = _HS256_HEADER_B64 + b"." + _b64url_encode(json.dumps(payload, separators=(",", ":")).encode())
+    mac = signer.copy()
+    mac.update(signing_input)
+    return (signing_input + b"." + _b64url_encode(mac.digest())).decode("ascii")
+
+
+def _verify_hs256(token: str, signer: "hmac.HMAC") -> Optional[Dict[str, Any]]:
+    """Verify an HS256 JWT against a keyed signer and return its payload, or None.
+
+    Only the fixed header minted by this module is accepted, so no algorithm
+    negotiation takes place. Registered claims such as exp are left to the caller.
+    """
+    try:
+        parts = token.encode("ascii").split(b".")
+    except UnicodeEncodeError:
+        return None
+    if len(parts) != 3 or parts[0] != _HS256_HEADER_B64:
+        return None
+
+    header, body, signature = parts
+    mac = signer.copy()
+    mac.update(header + b"." + body)
+    if not hmac.compare_digest(_b64url_encode(mac.digest()), signature):
+        return None
+
+    try:
+        payload = json.loads(_b64url_decode(body))
+    except ValueError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _token_urlsafe(nbytes: int) -> str:
+    """Equivalent of secrets.token_urlsafe() without the base64 module wrappers."""
+    return _b64url_encode(urandom(nbytes)).decode("ascii")
+
+
+def _pkce_s256_challenge(code_verifier: str) -> str:
+    """Compute the PKCE S256 code challenge for a verifier (RFC 7636 section 4.2)."""
+    return _b64url_encode(hashlib.sha256(code_verifier.encode()).digest()).decode("ascii")
+
+
+@lru_cache(maxsize=8)
+def _build_metadata(issuer: str, enable_dcr: bool) -> Dict[str, Any]:
+    """Build the RFC 8414 metadata document; cached per issuer URL."""
+    return {
+        "issuer": issuer,
+        "authorization_endpoint": f"{issuer}/oauth/authorize",
+        "token_endpoint": f"{issuer}/oauth/token",
+        "registration_endpoint": f"{issuer}/oauth/register" if enable_dcr else None,
+        "revocation_endpoint": f"{issuer}/oauth/revoke",
+        "response_types_supported": ["code"],
+        "grant_types_supported": ["authorization_code", "refresh_token"],
+        "token_endpoint_auth_methods_supported": ["client_secret_post", "client_secret_basic"],
+        "scopes_supported": ["wazuh:read", "wazuh:write"],
+        "code_challenge_methods_supported": ["S256", "plain"],
+        "service_documentation": f"{issuer}/docs",
+    }
+
+
 # OAuth 2.0 Error Codes (RFC 6749)
 OAUTH_ERRORS = {
     "invalid_request": "The request is missing a required parameter or is malformed",
@@ -45,8 +136,15 @@ class OAuthClient:
     grant_types: List[str] = field(default_factory=lambda: ["authorization_code", "refresh_token"])
     response_types: List[str] = field(default_factory=lambda: ["code"])
     scope: str = "wazuh:read wazuh:write"
-    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: float = field(default_factory=_time)  # Unix epoch seconds
     token_endpoint_auth_method: str = "client_secret_post"
+    # Derived lookups, built once at registration
+    client_secret_bytes: bytes = field(init=False, repr=False)
+    redirect_uris_set: FrozenSet[str] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.client_secret_bytes = self.client_secret.encode()
+        self.redirect_uris_set = frozenset(self.redirect_uris)
 
     def to_registration_response(self) -> Dict[str, Any]:
         """Convert to DCR registration response."""
@@ -59,7 +157,7 @@ class OAuthClient:
             "response_types": self.response_types,
             "scope": self.scope,
             "token_endpoint_auth_method": self.token_endpoint_auth_method,
-            "client_id_issued_at": int(self.created_at.timestamp()),
+            "client_id_issued_at": int(self.created_at),
         }
 
 
@@ -71,13 +169,13 @@ class AuthorizationCode:
     client_id: str
     redirect_uri: str
     scope: str
-    created_at: datetime
-    expires_at: datetime
+    created_at: float  # Unix epoch seconds
+    expires_at: float
     code_challenge: Optional[str] = None
     code_challenge_method: Optional[str] = None
 
     def is_expired(self) -> bool:
-        return datetime.now(timezone.utc) > self.expires_at
+        return _time() > self.expires_at
 
 
 @dataclass
@@ -88,11 +186,11 @@ class OAuthToken:
     token_type: str  # "access" or "refresh"
     client_id: str
     scope: str
-    created_at: datetime
-    expires_at: datetime
+    created_at: float  # Unix epoch seconds
+    expires_at: float
 
     def is_expired(self) -> bool:
-        return datetime.now(timezone.utc) > self.expires_at
+        return _time() > self.expires_at
 
 
 class OAuthManager:
@@ -101,10 +199,23 @@ class OAuthManager:
     def __init__(self, config):
         self.config = config
         self.secret_key = config.AUTH_SECRET_KEY
+        self._static_issuer = config.OAUTH_ISSUER_URL
+        self._signer = hmac.new(self.secret_key.encode(), digestmod=hashlib.sha256)
         self.clients: Dict[str, OAuthClient] = {}
-        self.authorization_codes: Dict[str, AuthorizationCode] = {}
-        self.access_tokens: Dict[str, OAuthToken] = {}
-        self.refresh_tokens: Dict[str, OAuthToken] = {}
+        # Bounded in insertion order so the oldest entries are evicted first
+        self.authorization_codes: "OrderedDict[str, AuthorizationCode]" = OrderedDict()
+        # Access tokens are self-describing JWTs and are not stored; refresh
+        # tokens are tracked so they can be revoked.
+        self.refresh_tokens: "OrderedDict[str, OAuthToken]" = OrderedDict()
+        self._max_codes = config.OAUTH_MAX_AUTHORIZATION_CODES
+        self._max_refresh_tokens = config.OAUTH_MAX_REFRESH_TOKENS
+        # Verified access-token payloads; expiry and client checks still run per call
+        self._verified_tokens = create_token_cache()
+
+        # TTLs are fixed for the server lifetime; build them once
+        self._access_ttl_int = int(config.OAUTH_ACCESS_TOKEN_TTL)
+        self._refresh_ttl_int = int(config.OAUTH_REFRESH_TOKEN_TTL)
+        self._code_ttl_int = int(config.OAUTH_AUTHORIZATION_CODE_TTL)
 
         # Pre-register Claude as a known client
         self._register_claude_client()
@@ -128,30 +239,17 @@ class OAuthManager:
 
     def get_issuer_url(self, request: Request) -> str:
         """Get the OAuth issuer URL."""
-        if self.config.OAUTH_ISSUER_URL:
-            return self.config.OAUTH_ISSUER_URL
+        if self._static_issuer:
+            return self._static_issuer
         # Derive from request
-        scheme = request.headers.get("x-forwarded-proto", request.url.scheme)
-        host = request.headers.get("x-forwarded-host", request.url.netloc)
+        headers = request.headers
+        scheme = headers.get("x-forwarded-proto") or request.url.scheme
+        host = headers.get("x-forwarded-host") or request.url.netloc
         return f"{scheme}://{host}"
 
     def get_metadata(self, request: Request) -> Dict[str, Any]:
         """Get OAuth 2.0 Authorization Server Metadata (RFC 8414)."""
-        issuer = self.get_issuer_url(request)
-
-        return {
-            "issuer": issuer,
-            "authorization_endpoint": f"{issuer}/oauth/authorize",
-            "token_endpoint": f"{issuer}/oauth/token",
-            "registration_endpoint": f"{issuer}/oauth/register" if self.config.OAUTH_ENABLE_DCR else None,
-            "revocation_endpoint": f"{issuer}/oauth/revoke",
-            "response_types_supported": ["code"],
-            "grant_types_supported": ["authorization_code", "refresh_token"],
-            "token_endpoint_auth_methods_supported": ["client_secret_post", "client_secret_basic"],
-            "scopes_supported": ["wazuh:read", "wazuh:write"],
-            "code_challenge_methods_supported": ["S256", "plain"],
-            "service_documentation": f"{issuer}/docs",
-        }
+        return dict(_build_metadata(self.get_issuer_url(request), self.config.OAUTH_ENABLE_DCR))
 
     def register_client(self, request_data: Dict[str, Any]) -> OAuthClient:
         """Dynamic Client Registration (RFC 7591)."""
@@ -187,10 +285,10 @@ class OAuthManager:
     def validate_client(self, client_id: str, client_secret: Optional[str] = None) -> Optional[OAuthClient]:
         """Validate client credentials."""
         client = self.clients.get(client_id)
-        if not client:
-            return None
+        if not client or not client_secret:
+            return client
 
-        if client_secret and not secrets.compare_digest(client.client_secret, client_secret):
+        if not secrets.compare_digest(client.client_secret_bytes, client_secret.encode()):
             return None
 
         return client
@@ -204,20 +302,21 @@ class OAuthManager:
         code_challenge_method: Optional[str] = None,
     ) -> str:
         """Create authorization code for OAuth flow."""
-        code = secrets.token_urlsafe(32)
+        code = _token_urlsafe(32)
+        now = _time()
 
         auth_code = AuthorizationCode(
             code=code,
             client_id=client_id,
             redirect_uri=redirect_uri,
             scope=scope,
-            created_at=datetime.now(timezone.utc),
-            expires_at=datetime.now(timezone.utc) + timedelta(seconds=self.config.OAUTH_AUTHORIZATION_CODE_TTL),
+            created_at=now,
+            expires_at=now + self._code_ttl_int,
             code_challenge=code_challenge,
             code_challenge_method=code_challenge_method,
         )
 
-        self.authorization_codes[code] = auth_code
+        self._insert_bounded(self.authorization_codes, code, auth_code, self._max_codes)
         return code
 
     def exchange_code_for_tokens(
@@ -245,10 +344,7 @@ class OAuthManager:
                 raise ValueError("invalid_grant")
 
             if auth_code.code_challenge_method == "S256":
-                computed = hashlib.sha256(code_verifier.encode()).digest()
-                import base64
-
-                computed_challenge = base64.urlsafe_b64encode(computed).rstrip(b"=").decode()
+                computed_challenge = _pkce_s256_challenge(code_verifier)
             else:  # plain
                 computed_challenge = code_verifier
 
@@ -256,27 +352,20 @@ class OAuthManager:
                 raise ValueError("invalid_grant")
 
         # Generate tokens
-        access_token = self._create_jwt_token(client_id, auth_code.scope, "access")
-        refresh_token = self._create_jwt_token(client_id, auth_code.scope, "refresh")
-
-        # Store tokens
-        self.access_tokens[access_token] = OAuthToken(
-            token=access_token,
-            token_type="access",
-            client_id=client_id,
-            scope=auth_code.scope,
-            created_at=datetime.now(timezone.utc),
-            expires_at=datetime.now(timezone.utc) + timedelta(seconds=self.config.OAUTH_ACCESS_TOKEN_TTL),
-        )
+        now = _time()
+        access_token = self._create_jwt_token(client_id, auth_code.scope, "access", now)
+        refresh_token = self._create_jwt_token(client_id, auth_code.scope, "refresh", now)
 
-        self.refresh_tokens[refresh_token] = OAuthToken(
+        # Store refresh token for revocation
+        refresh_obj = OAuthToken(
             token=refresh_token,
             token_type="refresh",
             client_id=client_id,
             scope=auth_code.scope,
-            created_at=datetime.now(timezone.utc),
-            expires_at=datetime.now(timezone.utc) + timedelta(seconds=self.config.OAUTH_REFRESH_TOKEN_TTL),
+            created_at=now,
+            expires_at=now + self._refresh_ttl_int,
         )
+        self._insert_bounded(self.refresh_tokens, refresh_token, refresh_obj, self._max_refresh_tokens)
 
         # Remove used authorization code
         del self.authorization_codes[code]
@@ -284,7 +373,7 @@ class OAuthManager:
         return {
             "access_token": access_token,
             "token_type": "Bearer",
-            "expires_in": self.config.OAUTH_ACCESS_TOKEN_TTL,
+            "expires_in": self._access_ttl_int,
             "refresh_token": refresh_token,
             "scope": auth_code.scope,
         }
@@ -304,53 +393,49 @@ class OAuthManager:
             raise ValueError("invalid_grant")
 
         # Generate new access token
-        access_token = self._create_jwt_token(client_id, token_obj.scope, "access")
-
-        self.access_tokens[access_token] = OAuthToken(
-            token=access_token,
-            token_type="access",
-            client_id=client_id,
-            scope=token_obj.scope,
-            created_at=datetime.now(timezone.utc),
-            expires_at=datetime.now(timezone.utc) + timedelta(seconds=self.config.OAUTH_ACCESS_TOKEN_TTL),
-        )
+        now = _time()
+        access_token = self._create_jwt_token(client_id, token_obj.scope, "access", now)
 
         return {
             "access_token": access_token,
             "token_type": "Bearer",
-            "expires_in": self.config.OAUTH_ACCESS_TOKEN_TTL,
+            "expires_in": self._access_ttl_int,
             "scope": token_obj.scope,
         }
 
     def validate_access_token(self, token: str) -> Optional[OAuthToken]:
         """Validate access token."""
-        # First check in-memory tokens
-        token_obj = self.access_tokens.get(token)
-        if token_obj and not token_obj.is_expired():
-            return token_obj
-
-        # Try to decode as JWT
-        try:
-            payload = jwt.decode(token, self.secret_key, algorithms=["HS256"])
-            if payload.get("type") == "access":
-                return OAuthToken(
-                    token=token,
-                    token_type="access",
-                    client_id=payload.get("client_id", ""),
-                    scope=payload.get("scope", ""),
-                    created_at=datetime.fromtimestamp(payload.get("iat", 0), timezone.utc),
-                    expires_at=datetime.fromtimestamp(payload.get("exp", 0), timezone.utc),
-                )
-        except JWTError:
-            pass
+        payload = self._verified_tokens.get(token)
+        if payload is None:
+            payload = _verify_hs256(token, self._signer)
+            if payload is None or payload.get("type") != "access":
+                return None
+
+            exp = payload.get("exp")
+            if not isinstance(exp, (int, float)) or exp <= _time():
+                return None
+            self._verified_tokens.put(token, payload, exp)
+        else:
+            exp = payload["exp"]
+            if exp <= _time():
+                return None
+
+        # Tokens of deleted clients are no longer honoured
+        client_id = payload.get("client_id", "")
+        if client_id not in self.clients:
+            return None
 
-        return None
+        return OAuthToken(
+            token=token,
+            token_type="access",
+            client_id=client_id,
+            scope=payload.get("scope", ""),
+            created_at=payload.get("iat", 0),
+            expires_at=exp,
+        )
 
     def revoke_token(self, token: str) -> bool:
-        """Revoke access or refresh token."""
-        if token in self.access_tokens:
-            del self.access_tokens[token]
-            return True
+        """Revoke refresh token. Access tokens are short-lived JWTs and expire on their own."""
         if token in self.refresh_tokens:
             del self.refresh_tokens[token]
             return True
@@ -361,35 +446,47 @@ class OAuthManager:
         if client_id not in self.clients:
             return False
 
-        # Remove all tokens for this client
-        self.access_tokens = {k: v for k, v in self.access_tokens.items() if v.client_id != client_id}
-        self.refresh_tokens = {k: v for k, v in self.refresh_tokens.items() if v.client_id != client_id}
+        # Remove all refresh tokens for this client; its access tokens stop
+        # validating once the client is gone
+        for token in [k for k, v in self.refresh_tokens.items() if v.client_id == client_id]:
+            del self.refresh_tokens[token]
 
         del self.clients[client_id]
         logger.info(f"Deleted OAuth client: {client_id}")
         return True
 
-    def _create_jwt_token(self, client_id: str, scope: str, token_type: str) -> str:
+    @staticmethod
+    def _insert_bounded(store: "OrderedDict[str, Any]", key: str, value: Any, cap: int) -> None:
+        """Insert into an ordered store, evicting the oldest entries above cap."""
+        store[key] = value
+        store.move_to_end(key)
+        while len(store) > cap:
+            store.popitem(last=False)
+
+    def _create_jwt_token(self, client_id: str, scope: str, token_type: str, now: Optional[float] = None) -> str:
         """Create JWT token."""
-        ttl = self.config.OAUTH_ACCESS_TOKEN_TTL if token_type == "access" else self.config.OAUTH_REFRESH_TOKEN_TTL
+        ttl = self._access_ttl_int if token_type == "access" else self._refresh_ttl_int
+        if now is None:
+            now = _time()
 
+        # client_id identifies the subject; a duplicate "sub" claim is not emitted
         payload = {
-            "sub": client_id,
             "client_id": client_id,
             "scope": scope,
             "type": token_type,
-            "iat": datetime.now(timezone.utc).timestamp(),
-            "exp": (datetime.now(timezone.utc) + timedelta(seconds=ttl)).timestamp(),
-            "jti": secrets.token_urlsafe(16),
+            "iat": now,
+            "exp": now + ttl,
+            "jti": urandom(12).hex(),  # Unique ID only; token integrity comes from the signature
         }
 
-        return jwt.encode(payload, self.secret_key, algorithm="HS256")
+        return _sign_hs256(payload, self._signer)
 
     def cleanup_expired(self):
         """Clean up expired tokens and codes."""
-        self.authorization_codes = {k: v for k, v in self.authorization_codes.items() if not v.is_expired()}
-        self.access_tokens = {k: v for k, v in self.access_tokens.items() if not v.is_expired()}
-        self.refresh_tokens = {k: v for k, v in self.refresh_tokens.items() if not v.is_expired()}
+        now = _time()
+        for store in (self.authorization_codes, self.refresh_tokens):
+            for key in [k for k, v in store.items() if v.expires_at < now]:
+                del store[key]
 
 
 def create_oauth_router(oauth_manager: OAuthManager) -> APIRouter:
@@ -414,7 +511,7 @@ def create_oauth_router(oauth_manager: OAuthManager) -> APIRouter:
             return JSONResponse({"error": "invalid_client", "error_description": "Unknown client"}, status_code=401)
 
         # Validate redirect_uri
-        if redirect_uri not in client.redirect_uris:
+        if redirect_uri not in client.redirect_uris_set:
             return JSONResponse(
                 {"error": "invalid_request", "error_description": "Invalid redirect_uri"}, status_code=400
             )
@@ -435,13 +532,10 @@ def create_oauth_router(oauth_manager: OAuthManager) -> APIRouter:
             code_challenge_method=code_challenge_method,
         )
 
-        # Redirect back with code
-        params = {"code": code}
+        # Redirect back with code (same encoding urlencode() would produce)
         if state:
-            params["state"] = state
-
-        redirect_url = f"{redirect_uri}?{urlencode(params)}"
-        return RedirectResponse(redirect_url)
+            return RedirectResponse(f"{redirect_uri}?code={quote_plus(code)}&state={quote_plus(state)}")
+        return RedirectResponse(f"{redirect_uri}?code={quote_plus(code)}")
 
     @router.post("/token")
     async def token(
@@ -459,12 +553,15 @@ def create_oauth_router(oauth_manager: OAuthManager) -> APIRouter:
         if not client_id:
             auth_header = request.headers.get("Authorization", "")
             if auth_header.startswith("Basic "):
-                import base64
-
                 try:
-                    decoded = base64.b64decode(auth_header[6:]).decode()
-                    client_id, client_secret = decoded.split(":", 1)
-                except (ValueError, UnicodeDecodeError) as e:
+                    raw = a2b_base64(auth_header[6:])
+                    idx = raw.find(b":")
+                    if idx < 0:
+                        raise ValueError("missing ':' separator")
+                    client_id = raw[:idx].decode()
+                    client_secret = raw[idx + 1 :].decode()
+                except ValueError as e:  # Includes binascii.Error and UnicodeDecodeError
+                    client_id = client_secret = None
                     logger.debug(f"Failed to decode Basic auth header: {e}")
 
         if not client_id:
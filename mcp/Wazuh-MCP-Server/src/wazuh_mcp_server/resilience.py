@@ -6,15 +6,15 @@ Implements comprehensive error handling and recovery mechanisms
 
 import asyncio
 import functools
+import gc
 import logging
 import time
-from dataclasses import dataclass
-from enum import Enum
-from typing import Any, Callable, Optional, Type
+from collections import deque
+from enum import IntEnum
+from typing import Any, Callable, NamedTuple, Optional, Tuple, Type
 
 import httpx
 from fastapi import HTTPException
-from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 logger = logging.getLogger(__name__)
 
@@ -24,19 +24,28 @@ WAZUH_API_MAX_CONCURRENT = 10
 SSE_MAX_CONCURRENT_CONNECTIONS = 100
 AUTH_MAX_CONCURRENT_REQUESTS = 20
 FALLBACK_SEMAPHORE_LIMIT = 5
+GC_MIN_YOUNG_OBJECTS = 100
 
+# Shared rejection for open circuits; raised with a fresh traceback each time and
+# never from inside an except block, so the instance does not hold on to the
+# frames or __context__ of earlier requests
+_CB_OPEN_EXC = HTTPException(status_code=503, detail="Service temporarily unavailable - circuit breaker open")
 
-class CircuitBreakerState(Enum):
-    """Circuit breaker states."""
 
-    CLOSED = "closed"
-    OPEN = "open"
-    HALF_OPEN = "half_open"
+class CircuitBreakerState(IntEnum):
+    """Circuit breaker states.
 
+    CLOSED is 0 so the common case is a single falsy check; the values also
+    match the wazuh_mcp_circuit_breaker_state Prometheus gauge.
+    """
 
-@dataclass
-class CircuitBreakerConfig:
-    """Circuit breaker configuration."""
+    CLOSED = 0
+    OPEN = 1
+    HALF_OPEN = 2
+
+
+class CircuitBreakerConfig(NamedTuple):
+    """Circuit breaker configuration (immutable)."""
 
     failure_threshold: int = 5
     recovery_timeout: int = 60
@@ -47,12 +56,17 @@ class CircuitBreakerConfig:
 class CircuitBreaker:
     """Circuit breaker implementation with fallback support."""
 
+    __slots__ = ("config", "state", "failure_count", "last_failure_monotonic", "next_retry_monotonic", "_reject")
+
     def __init__(self, config: CircuitBreakerConfig):
         self.config = config
         self.state = CircuitBreakerState.CLOSED
         self.failure_count = 0
-        self.last_failure_time: Optional[float] = None
-        self.next_retry_time: Optional[float] = None
+        self.last_failure_monotonic: Optional[float] = None
+        # Monotonic deadline after which an OPEN breaker may try HALF_OPEN
+        self.next_retry_monotonic = 0.0
+        # Rejection strategy for open circuits, chosen once instead of per call
+        self._reject = self._reject_with_fallback if config.fallback_function else self._reject_raise
 
     def __call__(self, func: Callable) -> Callable:
         """Decorator to apply circuit breaker to function."""
@@ -65,58 +79,70 @@ class CircuitBreaker:
 
     async def _call(self, func: Callable, *args, **kwargs) -> Any:
         """Execute function with circuit breaker logic."""
-
-        # Check if circuit is open
-        if self.state == CircuitBreakerState.OPEN:
-            if self._should_attempt_reset():
-                self.state = CircuitBreakerState.HALF_OPEN
-                logger.info(f"Circuit breaker {func.__name__} moved to HALF_OPEN")
-            else:
-                if self.config.fallback_function:
-                    logger.warning(f"Circuit breaker {func.__name__} OPEN, using fallback")
-                    return await self.config.fallback_function(*args, **kwargs)
-                else:
-                    raise HTTPException(
-                        status_code=503, detail="Service temporarily unavailable - circuit breaker open"
-                    )
+        if not self.fast_check(func.__name__):
+            return await self._reject(func.__name__, *args, **kwargs)
 
         try:
             result = await func(*args, **kwargs)
-            await self._on_success(func.__name__)
+            self.record_success(func.__name__)
             return result
 
         except self.config.expected_exception as e:
-            await self._on_failure(func.__name__, e)
+            self.record_failure(func.__name__, e)
             raise
         except Exception as e:
             # Unexpected exceptions don't count as circuit breaker failures
             logger.error(f"Unexpected error in {func.__name__}: {e}")
             raise
 
+    def fast_check(self, func_name: str) -> bool:
+        """Admit or reject a call.
+
+        Returns True if the call may proceed and False if the circuit is open,
+        in which case the caller should return ``await self._reject(...)``.
+        """
+        state = self.state
+        if state and state == CircuitBreakerState.OPEN:
+            if not self._should_attempt_reset():
+                return False
+            self.state = CircuitBreakerState.HALF_OPEN
+            logger.info(f"Circuit breaker {func_name} moved to HALF_OPEN")
+        return True
+
+    async def _reject_raise(self, func_name: str, *args, **kwargs) -> Any:
+        """Reject a call on an open circuit with HTTP 503."""
+        raise _CB_OPEN_EXC.with_traceback(None)
+
+    async def _reject_with_fallback(self, func_name: str, *args, **kwargs) -> Any:
+        """Serve a call on an open circuit from the fallback function."""
+        logger.warning(f"Circuit breaker {func_name} OPEN, using fallback")
+        return await self.config.fallback_function(*args, **kwargs)
+
     def _should_attempt_reset(self) -> bool:
         """Check if enough time has passed to attempt reset."""
-        if self.last_failure_time is None:
-            return True
-        return time.time() - self.last_failure_time >= self.config.recovery_timeout
+        return time.monotonic() >= self.next_retry_monotonic
 
-    async def _on_success(self, func_name: str):
+    def record_success(self, func_name: str):
         """Handle successful execution."""
         if self.state == CircuitBreakerState.HALF_OPEN:
             self.state = CircuitBreakerState.CLOSED
             logger.info(f"Circuit breaker {func_name} reset to CLOSED")
 
         self.failure_count = 0
-        self.last_failure_time = None
+        self.last_failure_monotonic = None
 
-    async def _on_failure(self, func_name: str, exception: Exception):
+    def record_failure(self, func_name: str, exception: Exception):
         """Handle failed execution."""
-        self.failure_count += 1
-        self.last_failure_time = time.time()
+        failure_count = self.failure_count + 1
+        self.failure_count = failure_count
+        now = time.monotonic()
+        self.last_failure_monotonic = now
 
-        if self.failure_count >= self.config.failure_threshold:
+        if failure_count >= self.config.failure_threshold:
             self.state = CircuitBreakerState.OPEN
+            self.next_retry_monotonic = now + self.config.recovery_timeout
             logger.warning(
-                f"Circuit breaker {func_name} opened after {self.failure_count} failures. " f"Last error: {exception}"
+                f"Circuit breaker {func_name} opened after {failure_count} failures. " f"Last error: {exception}"
             )
 
 
@@ -138,56 +164,100 @@ class TimeoutManager:
 
     @classmethod
     def with_timeout(cls, operation: str):
-        """Decorator to apply timeout to async function."""
+        """Decorator to apply timeout to async function.
+
+        The timeout is resolved once, when the decorator is created.
+        """
+        timeout = cls.get_timeout(operation)
+        timeout_exc = HTTPException(status_code=408, detail=f"Operation timed out after {timeout} seconds")
 
         def decorator(func: Callable) -> Callable:
             @functools.wraps(func)
             async def wrapper(*args, **kwargs):
-                timeout = cls.get_timeout(operation)
                 try:
                     return await asyncio.wait_for(func(*args, **kwargs), timeout=timeout)
                 except asyncio.TimeoutError:
                     logger.error(f"Operation {func.__name__} timed out after {timeout}s")
-                    raise HTTPException(status_code=408, detail=f"Operation timed out after {timeout} seconds")
+                # Raised outside the handler so the shared instance doesn't chain the TimeoutError
+                raise timeout_exc.with_traceback(None)
 
             return wrapper
 
         return decorator
 
 
+def _exponential_retry(
+    attempts: int, retry_on: Tuple[Type[BaseException], ...], multiplier: float, min_wait: float, max_wait: float
+) -> Callable:
+    """Build an async retry runner with exponential backoff.
+
+    The returned coroutine function is called as ``await run(func, *args, **kwargs)``.
+    The n-th retry waits ``multiplier * 2 ** (n - 1)`` seconds, clamped to
+    [min_wait, max_wait]; the last failure is re-raised.
+    """
+
+    async def run(func: Callable, *args, **kwargs) -> Any:
+        delay = multiplier
+        for attempt in range(1, attempts + 1):
+            try:
+                return await func(*args, **kwargs)
+            except retry_on:
+                if attempt == attempts:
+                    raise
+                await asyncio.sleep(min(max(delay, min_wait), max_wait))
+                delay *= 2
+
+    return run
+
+
+def _retry_decorator(run: Callable) -> Callable:
+    """Turn a retry runner into a decorator for async functions."""
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await run(func, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+_retry_wazuh = _exponential_retry(3, (httpx.RequestError, httpx.HTTPStatusError), 1, 1, 10)
+_retry_database = _exponential_retry(2, (ConnectionError, TimeoutError), 0.5, 0.5, 5)
+
+
 class RetryConfig:
     """Retry configuration."""
 
-    WAZUH_API_RETRY = retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        retry=retry_if_exception_type((httpx.RequestError, httpx.HTTPStatusError)),
-        reraise=True,
-    )
-
-    DATABASE_RETRY = retry(
-        stop=stop_after_attempt(2),
-        wait=wait_exponential(multiplier=0.5, min=0.5, max=5),
-        retry=retry_if_exception_type((ConnectionError, TimeoutError)),
-        reraise=True,
-    )
+    WAZUH_API_RETRY = _retry_decorator(_retry_wazuh)
+    DATABASE_RETRY = _retry_decorator(_retry_database)
 
 
 class GracefulShutdown:
     """Handle graceful shutdown of the application."""
 
+    __slots__ = ("shutdown_event", "active_count", "idle_event", "cleanup_tasks")
+
     def __init__(self):
         self.shutdown_event = asyncio.Event()
-        self.active_connections: set = set()
-        self.cleanup_tasks: list = []
+        # Only the number of open connections matters for shutdown
+        self.active_count = 0
+        self.idle_event = asyncio.Event()
+        self.idle_event.set()
+        self.cleanup_tasks: deque = deque()
 
     def add_connection(self, connection_id: str):
         """Add active connection."""
-        self.active_connections.add(connection_id)
+        self.active_count += 1
+        self.idle_event.clear()
 
     def remove_connection(self, connection_id: str):
         """Remove active connection."""
-        self.active_connections.discard(connection_id)
+        if self.active_count > 0:
+            self.active_count -= 1
+        if self.active_count == 0:
+            self.idle_event.set()
 
     def add_cleanup_task(self, task: Callable):
         """Add cleanup task to run on shutdown."""
@@ -199,22 +269,20 @@ class GracefulShutdown:
         self.shutdown_event.set()
 
         # Wait for active connections to complete (with timeout)
-        max_wait = GRACEFUL_SHUTDOWN_TIMEOUT_SECONDS
-        start_time = time.time()
-
-        while self.active_connections and (time.time() - start_time) < max_wait:
-            logger.info(f"Waiting for {len(self.active_connections)} active connections...")
-            await asyncio.sleep(1)
-
-        if self.active_connections:
-            logger.warning(f"Forcing shutdown with {len(self.active_connections)} active connections")
-
-        # Run cleanup tasks
-        for task in self.cleanup_tasks:
+        if self.active_count:
+            logger.info(f"Waiting for {self.active_count} active connections...")
             try:
-                await task()
-            except Exception as e:
-                logger.error(f"Cleanup task failed: {e}")
+                await asyncio.wait_for(self.idle_event.wait(), timeout=GRACEFUL_SHUTDOWN_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                logger.warning(f"Forcing shutdown with {self.active_count} active connections")
+
+        # Run cleanup tasks concurrently so shutdown takes as long as the slowest one
+        results = await asyncio.gather(*(task() for task in self.cleanup_tasks), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Cleanup task failed: {result}")
+        # Drop references so cleanup closures can be collected
+        self.cleanup_tasks.clear()
 
         logger.info("Graceful shutdown completed")
 
@@ -255,25 +323,101 @@ class ErrorRecovery:
             return False
 
 
+class FastBulkhead:
+    """Concurrency limiter with a non-yielding fast path.
+
+    Used like an asyncio.Semaphore (``async with bulkhead:``). While a slot is
+    free and nobody is queued, entering only increments a counter and never
+    yields to the event loop, which is safe because asyncio is cooperative.
+    Callers only wait when the pool is saturated; released slots are handed
+    to queued waiters in FIFO order without taking a lock, so a cancelled
+    release can never lose a wake-up. The limit can be changed at runtime
+    with set_limit().
+    """
+
+    __slots__ = ("limit", "active", "_waiters")
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self._waiters: deque = deque()
+
+    async def __aenter__(self) -> "FastBulkhead":
+        # Fast path: free slot and no queued waiters to jump ahead of
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return self
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            if waiter.cancelled():
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass  # Already skipped over by _wake()
+            else:
+                # A slot was handed over just before the cancellation; pass it on
+                self.active -= 1
+                self._wake()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.active -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        """Hand free slots to queued waiters, oldest first."""
+        waiters = self._waiters
+        while waiters and self.active < self.limit:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                # The slot is claimed on the waiter's behalf so nobody can overtake it
+                self.active += 1
+                waiter.set_result(None)
+
+    async def set_limit(self, limit: int) -> None:
+        """Change the concurrency limit; a lower limit takes effect as slots are released."""
+        if limit < 1:
+            raise ValueError("Bulkhead limit must be at least 1")
+        self.limit = limit
+        self._wake()
+
+
 class BulkheadIsolation:
     """Isolate different components to prevent cascade failures."""
 
+    __slots__ = ("resource_pools",)
+
     def __init__(self):
         self.resource_pools = {
-            "wazuh_api": asyncio.Semaphore(WAZUH_API_MAX_CONCURRENT),
-            "sse_connections": asyncio.Semaphore(SSE_MAX_CONCURRENT_CONNECTIONS),
-            "authentication": asyncio.Semaphore(AUTH_MAX_CONCURRENT_REQUESTS),
+            "wazuh_api": FastBulkhead(WAZUH_API_MAX_CONCURRENT),
+            "sse_connections": FastBulkhead(SSE_MAX_CONCURRENT_CONNECTIONS),
+            "authentication": FastBulkhead(AUTH_MAX_CONCURRENT_REQUESTS),
         }
 
-    def get_semaphore(self, resource_type: str) -> asyncio.Semaphore:
-        """Get semaphore for resource type (synchronous, returns semaphore for use in async with)."""
-        if resource_type in self.resource_pools:
-            return self.resource_pools[resource_type]
-        else:
-            # Create and cache fallback semaphore to avoid creating new ones each time
-            if resource_type not in self.resource_pools:
-                self.resource_pools[resource_type] = asyncio.Semaphore(FALLBACK_SEMAPHORE_LIMIT)
-            return self.resource_pools[resource_type]
+    def get_semaphore(self, resource_type: str) -> FastBulkhead:
+        """Get the limiter for resource type (synchronous, returns limiter for use in async with)."""
+        pool = self.resource_pools.get(resource_type)
+        if pool is None:
+            # Create and cache fallback limiter to avoid creating new ones each time
+            pool = self.resource_pools[resource_type] = FastBulkhead(FALLBACK_SEMAPHORE_LIMIT)
+        return pool
+
+    async def resize(self, resource_type: str, limit: int) -> None:
+        """Resize a resource pool at runtime."""
+        await self.get_semaphore(resource_type).set_limit(limit)
+        logger.info(f"Bulkhead '{resource_type}' resized to {limit}")
+
+
+def _sync_memory_reclaim() -> int:
+    """Run a full garbage collection unless the youngest generation is nearly empty."""
+    if gc.get_count()[0] < GC_MIN_YOUNG_OBJECTS:
+        return 0
+    return gc.collect()
 
 
 class HealthRecovery:
@@ -300,9 +444,7 @@ class HealthRecovery:
         """Recover from memory pressure."""
         try:
             # Clear caches and force garbage collection
-            import gc
-
-            gc.collect()
+            _sync_memory_reclaim()
 
             # Clear expired sessions
             from wazuh_mcp_server.server import sessions
@@ -313,9 +455,11 @@ class HealthRecovery:
             try:
                 from wazuh_mcp_server.server import get_wazuh_client
 
-                client = await get_wazuh_client()
-                if hasattr(client, "_cache"):
-                    client._cache.clear()
+                # Shielded so a cancelled recovery cannot abort client initialization midway
+                client = await asyncio.shield(get_wazuh_client())
+                cache = getattr(client, "_cache", None)
+                if cache is not None:
+                    cache.clear()
             except (ImportError, RuntimeError):
                 pass  # Client may not be initialized yet
 
@@ -360,28 +504,58 @@ authentication_circuit_breaker = CircuitBreaker(
 
 
 # Decorators for common patterns
+def _resilient_call_factory(func: Callable, breaker: CircuitBreaker, resource_type: str, operation: str) -> Callable:
+    """Build a single-attempt call applying circuit breaker, bulkhead and timeout inline."""
+    timeout = TimeoutManager.get_timeout(operation)
+    timeout_exc = HTTPException(status_code=408, detail=f"Operation timed out after {timeout} seconds")
+    config = breaker.config
+    func_name = func.__name__
+    # Pools are resized in place, so the limiter can be resolved once here
+    bulkhead = bulkhead_isolation.get_semaphore(resource_type)
+
+    async def call_once(*args, **kwargs):
+        if not breaker.fast_check(func_name):
+            return await breaker._reject(func_name, *args, **kwargs)
+
+        try:
+            timed_out = False
+            try:
+                # One deadline covers both waiting for a bulkhead slot and the call itself
+                async with asyncio.timeout(timeout):
+                    async with bulkhead:
+                        result = await func(*args, **kwargs)
+            except asyncio.TimeoutError:
+                timed_out = True
+            if timed_out:
+                logger.error(f"Operation {func_name} timed out after {timeout}s")
+                # Raised outside the handler so the shared instance doesn't chain the TimeoutError
+                raise timeout_exc.with_traceback(None)
+        except config.expected_exception as e:
+            breaker.record_failure(func_name, e)
+            raise
+        except Exception as e:
+            # Unexpected exceptions don't count as circuit breaker failures
+            logger.error(f"Unexpected error in {func_name}: {e}")
+            raise
+
+        breaker.record_success(func_name)
+        return result
+
+    return call_once
+
+
 def with_wazuh_resilience(func: Callable) -> Callable:
     """Apply resilience patterns for Wazuh API calls."""
+    call_once = _resilient_call_factory(func, wazuh_api_circuit_breaker, "wazuh_api", "http_request")
 
-    @RetryConfig.WAZUH_API_RETRY
-    @wazuh_api_circuit_breaker
-    @TimeoutManager.with_timeout("http_request")
     @functools.wraps(func)
     async def wrapper(*args, **kwargs):
-        async with bulkhead_isolation.get_semaphore("wazuh_api"):
-            return await func(*args, **kwargs)
+        return await _retry_wazuh(call_once, *args, **kwargs)
 
     return wrapper
 
 
 def with_auth_resilience(func: Callable) -> Callable:
     """Apply resilience patterns for authentication."""
-
-    @authentication_circuit_breaker
-    @TimeoutManager.with_timeout("authentication")
-    @functools.wraps(func)
-    async def wrapper(*args, **kwargs):
-        async with bulkhead_isolation.get_semaphore("authentication"):
-            return await func(*args, **kwargs)
-
-    return wrapper
+    call_once = _resilient_call_factory(func, authentication_circuit_breaker, "authentication", "authentication")
+    return functools.wraps(func)(call_once)
@@ -4,19 +4,29 @@ Production security hardening and edge case handling for Wazuh MCP Server
 Implements comprehensive security measures and error handling
 """
 
+import ipaddress
 import logging
 import os
 import re
+import threading
 import time
-from collections import defaultdict, deque
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Set
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Union
 
 import httpx
 from fastapi import HTTPException, Request
 
+try:
+    import hyperscan
+except ImportError:  # Optional accelerator; SecurityValidator falls back to re
+    hyperscan = None
+
+# Raised by some hyperscan builds when a match callback ends the scan early
+_HS_SCAN_TERMINATED = getattr(hyperscan, "ScanTerminated", ())
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,20 +48,82 @@ class ToolValidationError(ValueError):
 
 
 # Valid enum values for tool parameters
-VALID_TIME_RANGES = {"1h", "6h", "24h", "7d", "1d", "30d"}
-VALID_SEVERITIES = {"low", "medium", "high", "critical"}
-VALID_AGENT_STATUSES = {"active", "disconnected", "never_connected", "pending"}
-VALID_INDICATOR_TYPES = {"ip", "hash", "domain", "url"}
-VALID_REPORT_TYPES = {"daily", "weekly", "monthly", "incident"}
-VALID_COMPLIANCE_FRAMEWORKS = {"PCI-DSS", "HIPAA", "SOX", "GDPR", "NIST"}
+VALID_TIME_RANGES = frozenset({"1h", "6h", "24h", "7d", "1d", "30d"})
+VALID_SEVERITIES = frozenset({"low", "medium", "high", "critical"})
+VALID_AGENT_STATUSES = frozenset({"active", "disconnected", "never_connected", "pending"})
+VALID_INDICATOR_TYPES = frozenset({"ip", "hash", "domain", "url"})
+VALID_REPORT_TYPES = frozenset({"daily", "weekly", "monthly", "incident"})
+# Upper-cased spelling -> canonical framework name
+COMPLIANCE_FRAMEWORK_ALIASES = {
+    "PCI-DSS": "PCI-DSS",
+    "PCI": "PCI-DSS",
+    "PCIDSS": "PCI-DSS",
+    "HIPAA": "HIPAA",
+    "SOX": "SOX",
+    "GDPR": "GDPR",
+    "NIST": "NIST",
+}
+VALID_COMPLIANCE_FRAMEWORKS = frozenset(COMPLIANCE_FRAMEWORK_ALIASES.values())
+
+# Accepted string spellings for boolean parameters (matched after lowercasing)
+BOOLEAN_STRINGS = {
+    "true": True,
+    "1": True,
+    "yes": True,
+    "on": True,
+    "false": False,
+    "0": False,
+    "no": False,
+    "off": False,
+}
 
 # Regex patterns for parameter validation
 AGENT_ID_PATTERN = re.compile(r"^[0-9]{3,5}$")  # Wazuh agent IDs are numeric
 RULE_ID_PATTERN = re.compile(r"^[0-9]{1,6}$")  # Rule IDs are numeric
-ISO_TIMESTAMP_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}:\d{2}(\.\d+)?(Z|[+-]\d{2}:?\d{2})?)?$")
-IP_ADDRESS_PATTERN = re.compile(r"^(\d{1,3}\.){3}\d{1,3}$|^([0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}$")
+ISO_TIMESTAMP_MAX_LENGTH = 40  # Nanosecond fraction plus UTC offset fits comfortably
+# Accepted shape; datetime.fromisoformat alone also takes "T10", "10:00:00,5", "+01:00:30" and more
+ISO_TIMESTAMP_PATTERN = re.compile(
+    r"[0-9]{4}-[0-9]{2}-[0-9]{2}(T[0-9]{2}:[0-9]{2}:[0-9]{2}(\.[0-9]+)?(Z|[+-][0-9]{2}:?[0-9]{2})?)?"
+)
 HASH_PATTERN = re.compile(r"^[a-fA-F0-9]{32,128}$")  # MD5 to SHA-512
-DOMAIN_PATTERN = re.compile(r"^[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z]{2,})+$")
+DOMAIN_LABEL_CHARS = b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-"
+
+# Sentinel for absent dict keys
+_MISSING = object()
+
+# Characters rejected in batch JSON-RPC method names
+INVALID_METHOD_CHARS = frozenset("<>\"';|&")
+
+# Disallowed substrings, matched in a single pass as a literal alternation
+DANGEROUS_QUERY_PATTERN = re.compile(
+    "|".join(map(re.escape, ["<script", "javascript:", "; drop", "; delete", "--"])), re.IGNORECASE
+)
+DANGEROUS_INPUT_PATTERN = re.compile(
+    "|".join(map(re.escape, ["<script", "javascript:", "onerror=", "onclick=", "../", "..\\\\"])), re.IGNORECASE
+)
+
+
+def _is_valid_domain(domain: str) -> bool:
+    """Check domain syntax with a linear scan (no regex backtracking).
+
+    Labels are 1-63 ASCII letters, digits or hyphens without a leading or
+    trailing hyphen; the TLD is at least two letters; total length <= 253.
+    """
+    if len(domain) > 253 or not domain.isascii():
+        return False
+
+    labels = domain.split(".")
+    tld = labels.pop()
+    if not labels or len(tld) < 2 or not tld.isalpha():
+        return False
+
+    for label in labels:
+        if not 0 < len(label) <= 63 or label[0] == "-" or label[-1] == "-":
+            return False
+        # Deleting every allowed byte must leave nothing behind
+        if label.encode().translate(None, DOMAIN_LABEL_CHARS):
+            return False
+    return True
 
 
 def validate_limit(value: Any, min_val: int = 1, max_val: int = 1000, param_name: str = "limit") -> int:
@@ -128,6 +200,10 @@ def validate_time_range(value: Any, param_name: str = "time_range") -> str:
     if value is None:
         return "24h"  # Default
 
+    # Already-canonical input needs no normalization
+    if isinstance(value, str) and value in VALID_TIME_RANGES:
+        return value
+
     time_range = str(value).strip().lower()
 
     if time_range not in VALID_TIME_RANGES:
@@ -145,6 +221,9 @@ def validate_severity(value: Any, required: bool = False, param_name: str = "sev
             raise ToolValidationError(param_name, "is required")
         return None
 
+    if isinstance(value, str) and value in VALID_SEVERITIES:
+        return value
+
     severity = str(value).strip().lower()
 
     if severity not in VALID_SEVERITIES:
@@ -160,6 +239,9 @@ def validate_agent_status(value: Any, param_name: str = "status") -> Optional[st
     if value is None:
         return None
 
+    if isinstance(value, str) and value in VALID_AGENT_STATUSES:
+        return value
+
     status = str(value).strip().lower()
 
     if status not in VALID_AGENT_STATUSES:
@@ -184,7 +266,14 @@ def validate_timestamp(value: Any, required: bool = False, param_name: str = "ti
             raise ToolValidationError(param_name, "cannot be empty")
         return None
 
-    if not ISO_TIMESTAMP_PATTERN.match(timestamp):
+    # Shape check first; fromisoformat then rejects impossible dates such as 2024-02-30
+    valid = len(timestamp) <= ISO_TIMESTAMP_MAX_LENGTH and ISO_TIMESTAMP_PATTERN.fullmatch(timestamp) is not None
+    if valid:
+        try:
+            datetime.fromisoformat(timestamp)
+        except ValueError:
+            valid = False
+    if not valid:
         raise ToolValidationError(
             param_name, f"invalid ISO 8601 format '{timestamp}'", "Use format: YYYY-MM-DD or YYYY-MM-DDTHH:MM:SSZ"
         )
@@ -200,7 +289,9 @@ def validate_indicator(value: Any, indicator_type: str, param_name: str = "indic
     indicator = str(value).strip()
 
     if indicator_type == "ip":
-        if not IP_ADDRESS_PATTERN.match(indicator):
+        try:
+            ipaddress.ip_address(indicator)
+        except ValueError:
             raise ToolValidationError(
                 param_name, f"invalid IP address '{indicator}'", "Use valid IPv4 (e.g., '192.168.1.1') or IPv6 address"
             )
@@ -210,7 +301,7 @@ def validate_indicator(value: Any, indicator_type: str, param_name: str = "indic
                 param_name, f"invalid hash '{indicator}'", "Use valid MD5, SHA-1, SHA-256, or SHA-512 hash"
             )
     elif indicator_type == "domain":
-        if not DOMAIN_PATTERN.match(indicator):
+        if not _is_valid_domain(indicator):
             raise ToolValidationError(
                 param_name, f"invalid domain '{indicator}'", "Use valid domain format (e.g., 'example.com')"
             )
@@ -228,6 +319,9 @@ def validate_indicator_type(value: Any, param_name: str = "indicator_type") -> s
     if value is None:
         return "ip"  # Default
 
+    if isinstance(value, str) and value in VALID_INDICATOR_TYPES:
+        return value
+
     ind_type = str(value).strip().lower()
 
     if ind_type not in VALID_INDICATOR_TYPES:
@@ -243,6 +337,9 @@ def validate_report_type(value: Any, param_name: str = "report_type") -> str:
     if value is None:
         return "daily"  # Default
 
+    if isinstance(value, str) and value in VALID_REPORT_TYPES:
+        return value
+
     report_type = str(value).strip().lower()
 
     if report_type not in VALID_REPORT_TYPES:
@@ -258,13 +355,13 @@ def validate_compliance_framework(value: Any, param_name: str = "framework") ->
     if value is None:
         return "PCI-DSS"  # Default
 
-    framework = str(value).strip().upper()
+    if isinstance(value, str) and value in VALID_COMPLIANCE_FRAMEWORKS:
+        return value
 
-    # Normalize common variations
-    if framework == "PCI" or framework == "PCIDSS":
-        framework = "PCI-DSS"
+    # Normalizes case and common variations in one lookup
+    framework = COMPLIANCE_FRAMEWORK_ALIASES.get(str(value).strip().upper())
 
-    if framework not in VALID_COMPLIANCE_FRAMEWORKS:
+    if framework is None:
         raise ToolValidationError(
             param_name, f"invalid value '{value}'", f"Use one of: {', '.join(sorted(VALID_COMPLIANCE_FRAMEWORKS))}"
         )
@@ -282,13 +379,8 @@ def validate_query(value: Any, required: bool = True, param_name: str = "query")
     query = str(value).strip()
 
     # Check for dangerous patterns
-    dangerous = ["<script", "javascript:", "; drop", "; delete", "--"]
-    query_lower = query.lower()
-    for pattern in dangerous:
-        if pattern in query_lower:
-            raise ToolValidationError(
-                param_name, "contains disallowed pattern", "Remove special characters and try again"
-            )
+    if DANGEROUS_QUERY_PATTERN.search(query):
+        raise ToolValidationError(param_name, "contains disallowed pattern", "Remove special characters and try again")
 
     if len(query) > 500:
         raise ToolValidationError(param_name, f"too long ({len(query)} chars)", "Query must be 500 characters or less")
@@ -301,14 +393,13 @@ def validate_boolean(value: Any, default: bool = True, param_name: str = "flag")
     if value is None:
         return default
 
-    if isinstance(value, bool):
+    if value is True or value is False:
         return value
 
     if isinstance(value, str):
-        if value.lower() in ("true", "1", "yes", "on"):
-            return True
-        if value.lower() in ("false", "0", "no", "off"):
-            return False
+        result = BOOLEAN_STRINGS.get(value.lower())
+        if result is not None:
+            return result
 
     raise ToolValidationError(param_name, f"must be a boolean, got '{value}'", "Use true/false")
 
@@ -335,11 +426,9 @@ def validate_input(value: str, max_length: int = 1000, allowed_chars: Optional[s
         raise ValueError(f"Input exceeds maximum length of {max_length}")
 
     # Check for common injection patterns
-    dangerous_patterns = ["<script", "javascript:", "onerror=", "onclick=", "../", "..\\\\"]
-    value_lower = value.lower()
-    for pattern in dangerous_patterns:
-        if pattern in value_lower:
-            raise ValueError(f"Input contains disallowed pattern: {pattern}")
+    match = DANGEROUS_INPUT_PATTERN.search(value)
+    if match:
+        raise ValueError(f"Input contains disallowed pattern: {match.group(0).lower()}")
 
     return True
 
@@ -364,7 +453,6 @@ def validate_batch_items(items: List[Any], max_batch_size: int = 100) -> List[Di
     if len(items) > max_batch_size:
         raise ValueError(f"Batch size {len(items)} exceeds maximum of {max_batch_size}")
 
-    validated = []
     for idx, item in enumerate(items):
         if not isinstance(item, dict):
             raise ValueError(f"Batch item at index {idx} must be a dictionary")
@@ -373,35 +461,55 @@ def validate_batch_items(items: List[Any], max_batch_size: int = 100) -> List[Di
         if "jsonrpc" not in item:
             raise ValueError(f"Batch item at index {idx} missing 'jsonrpc' field")
 
-        if "method" not in item:
+        method = item.get("method", _MISSING)
+        if method is _MISSING:
             raise ValueError(f"Batch item at index {idx} missing 'method' field")
 
         # Validate method name
-        method = item.get("method", "")
         if not isinstance(method, str) or len(method) > 256:
             raise ValueError(f"Invalid method name at index {idx}")
 
         # Check for suspicious patterns in method
-        if any(p in method.lower() for p in ["<", ">", '"', "'", ";", "|", "&"]):
+        if not INVALID_METHOD_CHARS.isdisjoint(method):
             raise ValueError(f"Invalid characters in method name at index {idx}")
 
-        validated.append(item)
-
-    return validated
+    # Every item passed, so the validated list is a copy of the input
+    return list(items)
 
 
 # Sensitive data patterns for log sanitization
 SENSITIVE_PATTERNS = [
-    (r'(password["\']?\s*[:=]\s*["\']?)[^"\'\s,}]+', r"\1[REDACTED]"),
-    (r'(token["\']?\s*[:=]\s*["\']?)[^"\'\s,}]+', r"\1[REDACTED]"),
-    (r'(api[_-]?key["\']?\s*[:=]\s*["\']?)[^"\'\s,}]+', r"\1[REDACTED]"),
-    (r'(secret["\']?\s*[:=]\s*["\']?)[^"\'\s,}]+', r"\1[REDACTED]"),
-    (r'(authorization["\']?\s*[:=]\s*["\']?)[^"\'\s,}]+', r"\1[REDACTED]"),
-    (r"(bearer\s+)[a-zA-Z0-9._-]+", r"\1[REDACTED]"),
-    (r"wst_[a-zA-Z0-9_-]+", "wst_[REDACTED]"),
-    (r"wazuh_[a-zA-Z0-9_-]{40,}", "wazuh_[REDACTED]"),
+    (re.compile(pattern, re.IGNORECASE), replacement)
+    for pattern, replacement in [
+        (r'(password["\']?\s*[:=]\s*["\']?)[^"\'\s,}]+', r"\1[REDACTED]"),
+        (r'(token["\']?\s*[:=]\s*["\']?)[^"\'\s,}]+', r"\1[REDACTED]"),
+        (r'(api[_-]?key["\']?\s*[:=]\s*["\']?)[^"\'\s,}]+', r"\1[REDACTED]"),
+        (r'(secret["\']?\s*[:=]\s*["\']?)[^"\'\s,}]+', r"\1[REDACTED]"),
+        (r'(authorization["\']?\s*[:=]\s*["\']?)[^"\'\s,}]+', r"\1[REDACTED]"),
+        (r"(bearer\s+)[a-zA-Z0-9._-]+", r"\1[REDACTED]"),
+        (r"wst_[a-zA-Z0-9_-]+", "wst_[REDACTED]"),
+        (r"wazuh_[a-zA-Z0-9_-]{40,}", "wazuh_[REDACTED]"),
+    ]
 ]
 
+# Cheap substring prefilter: every SENSITIVE_PATTERNS match contains one of these
+SENSITIVE_TRIGGERS = ("password", "token", "api", "secret", "auth", "bearer", "wst_", "wazuh_")
+
+# Literal anchors of SENSITIVE_PATTERNS; group N marks a candidate for pattern N - 1.
+# The lookahead is zero-width so overlapping anchors ("secretoken") are all found.
+SENSITIVE_ANCHORS = re.compile(
+    r"(?=(password)|(token)|(api[_-]?key)|(secret)|(authorization)|(bearer)|(wst_)|(wazuh_))", re.IGNORECASE
+)
+
+
+def _contains_sensitive_trigger(text: str) -> bool:
+    """Cheap substring prefilter for sanitize_log_message."""
+    if not text.isascii():
+        # re.IGNORECASE also folds "ſ", "ı" and "İ" onto s and i, which str.lower() does not
+        return True
+    lowered = text.lower()
+    return any(trigger in lowered for trigger in SENSITIVE_TRIGGERS)
+
 
 def sanitize_log_message(message: str) -> str:
     """
@@ -413,11 +521,18 @@ def sanitize_log_message(message: str) -> str:
     Returns:
         Sanitized message with sensitive data redacted
     """
-    import re
+    if not _contains_sensitive_trigger(message):
+        return message
+
+    # One pass to find which patterns can apply
+    hits = {match.lastindex for match in SENSITIVE_ANCHORS.finditer(message)}
+    if not hits:
+        return message
 
     result = message
-    for pattern, replacement in SENSITIVE_PATTERNS:
-        result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
+    for group, (pattern, replacement) in enumerate(SENSITIVE_PATTERNS, 1):
+        if group in hits:
+            result = pattern.sub(replacement, result)
     return result
 
 
@@ -426,16 +541,27 @@ class SanitizingLogFilter(logging.Filter):
 
     def filter(self, record: logging.LogRecord) -> bool:
         """Filter and sanitize log record."""
-        if hasattr(record, "msg") and isinstance(record.msg, str):
+        # Non-string messages come from structured logging and are left alone,
+        # but their args are still sanitized below
+        if isinstance(record.msg, str):
             record.msg = sanitize_log_message(record.msg)
-        if hasattr(record, "args") and record.args:
+
+        args = record.args
+        if not args or not isinstance(args, tuple):
+            return True
+        if any(isinstance(arg, str) and _contains_sensitive_trigger(arg) for arg in args):
             sanitized_args = []
-            for arg in record.args:
+            changed = False
+            for arg in args:
                 if isinstance(arg, str):
-                    sanitized_args.append(sanitize_log_message(arg))
-                else:
-                    sanitized_args.append(arg)
-            record.args = tuple(sanitized_args)
+                    sanitized = sanitize_log_message(arg)
+                    if sanitized is not arg:
+                        changed = True
+                    arg = sanitized
+                sanitized_args.append(arg)
+            # Keep the original tuple when nothing was redacted
+            if changed:
+                record.args = tuple(sanitized_args)
         return True
 
 
@@ -456,42 +582,56 @@ class SecurityMetrics:
             self.last_reset = datetime.now(timezone.utc)
 
 
+RATE_LIMIT_MAX_TRACKED = 10000  # Identifiers kept by RateLimiter before evicting the least recent
+
+
 class RateLimiter:
-    """Advanced rate limiting with sliding window."""
+    """Per-identifier token-bucket rate limiting.
+
+    Each identifier gets a bucket of max_requests tokens refilled at
+    max_requests / window_seconds per second. Only the most recently seen
+    max_tracked identifiers are kept, bounding memory under IP floods.
+    """
 
-    def __init__(self, max_requests: int = 100, window_seconds: int = 60):
+    def __init__(self, max_requests: int = 100, window_seconds: int = 60, max_tracked: int = RATE_LIMIT_MAX_TRACKED):
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests: Dict[str, deque] = defaultdict(deque)
-        self.blocked_until: Dict[str, datetime] = {}
+        self.max_tracked = max_tracked
+        self.refill_rate = max_requests / window_seconds
+        # Block for up to 5 minutes; a denied bucket always holds max_requests spent tokens
+        self.block_duration = min(300, max_requests * 10)
+        # identifier -> [tokens, last_refill, blocked_until] (monotonic seconds), least recently seen first
+        self.buckets: OrderedDict[str, list] = OrderedDict()
 
     def is_allowed(self, identifier: str) -> tuple[bool, Optional[int]]:
         """Check if request is allowed. Returns (allowed, retry_after_seconds)."""
-        now = time.time()
-
-        # Check if currently blocked
-        if identifier in self.blocked_until:
-            if datetime.now(timezone.utc) < self.blocked_until[identifier]:
-                retry_after = int((self.blocked_until[identifier] - datetime.now(timezone.utc)).total_seconds())
-                return False, retry_after
-            else:
-                del self.blocked_until[identifier]
-
-        # Clean old requests
-        window_start = now - self.window_seconds
-        request_times = self.requests[identifier]
-        while request_times and request_times[0] < window_start:
-            request_times.popleft()
-
-        # Check rate limit
-        if len(request_times) >= self.max_requests:
-            # Block for escalating time periods
-            block_duration = min(300, len(request_times) * 10)  # Max 5 minutes
-            self.blocked_until[identifier] = datetime.now(timezone.utc) + timedelta(seconds=block_duration)
-            return False, block_duration
+        now = time.monotonic()
+
+        bucket = self.buckets.get(identifier)
+        if bucket is None:
+            # First sighting always has a full bucket, so entries are only created on the allow path
+            bucket = self.buckets[identifier] = [float(self.max_requests), now, 0.0]
+            if len(self.buckets) > self.max_tracked:
+                self.buckets.popitem(last=False)
+        else:
+            # Blocked callers refresh their LRU position too, so a flood of new
+            # identifiers can't evict them and hand them back a full bucket
+            self.buckets.move_to_end(identifier)
+            blocked_until = bucket[2]
+            if blocked_until > now:
+                return False, int(blocked_until - now)
+
+        # Refill for the time elapsed since the last request
+        tokens = min(self.max_requests, bucket[0] + (now - bucket[1]) * self.refill_rate)
+        bucket[1] = now
+
+        if tokens < 1:
+            bucket[0] = tokens
+            bucket[2] = now + self.block_duration
+            return False, self.block_duration
 
         # Allow request
-        request_times.append(now)
+        bucket[0] = tokens - 1
         return True, None
 
 
@@ -501,28 +641,65 @@ class SecurityValidator:
     # Pre-compiled regex patterns for performance (class-level constants)
     MAX_PAYLOAD_SIZE = 1024 * 1024  # 1MB
 
+    # (pattern, case_insensitive). Patterns require SQL/command context to avoid
+    # false positives on legitimate MCP tool names and JSON-RPC content
+    SUSPICIOUS_PATTERNS = (
+        # SQL Injection patterns (require SQL context around keywords)
+        (
+            r"\b(union\s+select|insert\s+into|delete\s+from|drop\s+(table|database)"
+            r"|alter\s+table|exec\s*\(|execute\s+|;\s*select\s+|;\s*drop\s+)",
+            True,
+        ),
+        # XSS patterns
+        (r"(<script|javascript:|onload=|onerror=)", True),
+        # Path traversal
+        (r"(\.\./|\.\.\\|%2e%2e)", False),
+        # Command injection (require shell context, not bare chars)
+        (r"(;\s*\w+\s|`[^`]+`|\$\([^)]+\)|\$\{[^}]+\})", False),
+    )
+
     def __init__(self):
-        import re
-
-        # Pre-compile patterns at initialization for O(1) matching per pattern
-        # Patterns require SQL/command context to avoid false positives on
-        # legitimate MCP tool names and JSON-RPC content
-        self._compiled_patterns = [
-            # SQL Injection patterns (require SQL context around keywords)
-            re.compile(
-                r"(?i)\b(union\s+select|insert\s+into|delete\s+from|drop\s+(table|database)"
-                r"|alter\s+table|exec\s*\(|execute\s+|;\s*select\s+|;\s*drop\s+)"
-            ),
-            # XSS patterns
-            re.compile(r"(?i)(<script|javascript:|onload=|onerror=)"),
-            # Path traversal
-            re.compile(r"(\.\./|\.\.\\|%2e%2e)"),
-            # Command injection (require shell context, not bare chars)
-            re.compile(r"(;\s*\w+\s|`[^`]+`|\$\([^)]+\)|\$\{[^}]+\})"),
-        ]
+        # Patterns are compiled on first use so importing this module stays cheap
+        self._combined_pattern = None
+        self._combined_bytes_pattern = None
+        self._hs_db = None
+        self._hs_scratch = None
         self.max_payload_size = self.MAX_PAYLOAD_SIZE
 
-    def validate_request(self, request: Request, body: Optional[str] = None) -> tuple[bool, Optional[str]]:
+    def _compile_patterns(self):
+        """Compile the scanners used by _contains_suspicious_pattern."""
+        # One alternation so the regex engine scans each input once; scoped
+        # flags keep case-insensitivity per pattern
+        combined = "|".join(
+            f"(?i:{pattern})" if caseless else f"(?:{pattern})" for pattern, caseless in self.SUSPICIOUS_PATTERNS
+        )
+        # Bytes variant lets request bodies be scanned without decoding them
+        self._combined_bytes_pattern = re.compile(combined.encode())
+        if hyperscan is not None:
+            try:
+                self._hs_db, self._hs_scratch = self._compile_hyperscan()
+            except Exception as e:
+                logger.warning(f"Hyperscan unavailable, using regex scanning: {e}")
+        # Assigned last: it marks compilation as done
+        self._combined_pattern = re.compile(combined)
+
+    def _compile_hyperscan(self):
+        """Compile all suspicious patterns into one Hyperscan block-mode database."""
+        base_flags = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+        db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        db.compile(
+            expressions=[pattern.encode() for pattern, _ in self.SUSPICIOUS_PATTERNS],
+            ids=list(range(len(self.SUSPICIOUS_PATTERNS))),
+            elements=len(self.SUSPICIOUS_PATTERNS),
+            flags=[
+                base_flags | (hyperscan.HS_FLAG_CASELESS if caseless else 0) for _, caseless in self.SUSPICIOUS_PATTERNS
+            ],
+        )
+        return db, hyperscan.Scratch(db)
+
+    def validate_request(
+        self, request: Request, body: Optional[Union[str, bytes]] = None
+    ) -> tuple[bool, Optional[str]]:
         """Validate request for security threats. Returns (is_safe, reason)."""
 
         # Check payload size
@@ -545,32 +722,65 @@ class SecurityValidator:
 
         return True, None
 
-    def _contains_suspicious_pattern(self, text: str) -> bool:
+    def _contains_suspicious_pattern(self, text: Union[str, bytes]) -> bool:
         """Check if text contains suspicious patterns using pre-compiled regex."""
-        for pattern in self._compiled_patterns:
-            if pattern.search(text):
-                return True
-        return False
+        if self._combined_pattern is None:
+            self._compile_patterns()
+
+        if isinstance(text, bytes):
+            # The UTF-8 Hyperscan database needs valid UTF-8; ASCII is checked cheaply
+            if self._hs_db is not None and text.isascii():
+                return self._hyperscan_match(text)
+            return self._combined_bytes_pattern.search(text) is not None
+
+        # Same rule as bytes: lone surrogates would encode to invalid UTF-8, which
+        # Hyperscan's UTF-8 mode doesn't define behaviour for
+        if self._hs_db is not None and text.isascii():
+            return self._hyperscan_match(text.encode())
+        return self._combined_pattern.search(text) is not None
+
+    def _hyperscan_match(self, data: bytes) -> bool:
+        """Scan data once for all patterns, stopping at the first match."""
+        matched = False
+
+        def on_match(pattern_id, start, end, flags, context):
+            nonlocal matched
+            matched = True
+            return True  # Terminate the scan
+
+        try:
+            self._hs_db.scan(data, match_event_handler=on_match, scratch=self._hs_scratch)
+        except _HS_SCAN_TERMINATED:
+            pass
+        return matched
 
 
 class CircuitBreaker:
     """Circuit breaker for external dependencies."""
 
+    # States
+    CLOSED = 0
+    OPEN = 1
+    HALF_OPEN = 2
+
     def __init__(self, failure_threshold: int = 5, recovery_timeout: int = 60):
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
         self.failure_count = 0
-        self.last_failure_time = None
-        self.state = "CLOSED"  # CLOSED, OPEN, HALF_OPEN
+        self.last_failure_time: Optional[float] = None  # time.monotonic()
+        self.state = self.CLOSED
+        # Guards state transitions so check-then-act is atomic across threads
+        self._lock = threading.Lock()
 
     @asynccontextmanager
     async def call(self):
         """Context manager for circuit breaker calls."""
-        if self.state == "OPEN":
-            if self._should_attempt_reset():
-                self.state = "HALF_OPEN"
-            else:
-                raise HTTPException(status_code=503, detail="Service temporarily unavailable")
+        with self._lock:
+            if self.state == self.OPEN:
+                if self._should_attempt_reset():
+                    self.state = self.HALF_OPEN
+                else:
+                    raise HTTPException(status_code=503, detail="Service temporarily unavailable")
 
         try:
             yield
@@ -583,20 +793,22 @@ class CircuitBreaker:
         """Check if enough time has passed to attempt reset."""
         if self.last_failure_time is None:
             return True
-        return time.time() - self.last_failure_time > self.recovery_timeout
+        return time.monotonic() - self.last_failure_time > self.recovery_timeout
 
     def _on_success(self):
         """Handle successful call."""
-        self.failure_count = 0
-        self.state = "CLOSED"
+        with self._lock:
+            self.failure_count = 0
+            self.state = self.CLOSED
 
     def _on_failure(self):
         """Handle failed call."""
-        self.failure_count += 1
-        self.last_failure_time = time.time()
+        with self._lock:
+            self.failure_count += 1
+            self.last_failure_time = time.monotonic()
 
-        if self.failure_count >= self.failure_threshold:
-            self.state = "OPEN"
+            if self.failure_count >= self.failure_threshold:
+                self.state = self.OPEN
 
 
 class SecurityManager:
@@ -610,29 +822,37 @@ class SecurityManager:
         )
         self.validator = SecurityValidator()
         self.circuit_breaker = CircuitBreaker()
-        self.trusted_proxies = set(os.getenv("TRUSTED_PROXIES", "").split(","))
+        # Loopback is always trusted; empty entries from an unset variable are dropped
+        self.trusted_proxies = frozenset(
+            proxy.strip() for proxy in os.getenv("TRUSTED_PROXIES", "").split(",") if proxy.strip()
+        ) | {"127.0.0.1", "::1"}
 
     def get_client_ip(self, request: Request) -> str:
         """Get real client IP accounting for proxies."""
-        # Check X-Forwarded-For header from trusted proxies
-        if "x-forwarded-for" in request.headers:
-            forwarded_ips = request.headers["x-forwarded-for"].split(",")
-            for ip in forwarded_ips:
-                ip = ip.strip()
-                if self._is_trusted_proxy(request.client.host):
-                    return ip
+        client_host = request.client.host
+
+        # Forwarding headers are only honoured from trusted proxies
+        if not self._is_trusted_proxy(client_host):
+            return client_host
+
+        headers = request.headers
+
+        # Check X-Forwarded-For header (first entry is the originating client)
+        forwarded_for = headers.get("x-forwarded-for")
+        if forwarded_for is not None:
+            return forwarded_for.split(",", 1)[0].strip()
 
         # Check X-Real-IP header
-        if "x-real-ip" in request.headers:
-            if self._is_trusted_proxy(request.client.host):
-                return request.headers["x-real-ip"]
+        real_ip = headers.get("x-real-ip")
+        if real_ip is not None:
+            return real_ip
 
         # Fall back to direct connection
-        return request.client.host
+        return client_host
 
     def _is_trusted_proxy(self, ip: str) -> bool:
         """Check if IP is a trusted proxy."""
-        return ip in self.trusted_proxies or ip in ["127.0.0.1", "::1"]
+        return ip in self.trusted_proxies
 
     async def validate_request(self, request: Request) -> None:
         """Comprehensive request validation."""
@@ -648,15 +868,13 @@ class SecurityManager:
                 headers={"Retry-After": str(retry_after)} if retry_after else {},
             )
 
-        # Read request body for validation
+        # Read request body for validation; it is scanned as bytes, so no decode is needed
         body = None
         if request.method == "POST":
             try:
-                body = await request.body()
-                body = body.decode("utf-8") if body else None
-            except (UnicodeDecodeError, RuntimeError) as e:
+                body = await request.body() or None
+            except RuntimeError as e:
                 logger.debug(f"Failed to read request body: {e}")
-                body = None
 
         # Validate for security threats
         is_safe, reason = self.validator.validate_request(request, body)
@@ -700,6 +918,13 @@ class MemoryManager:
         self.max_memory_bytes = max_memory_mb * 1024 * 1024
         self.last_check = time.time()
         self.check_interval = 30  # seconds
+        try:
+            import psutil
+
+            self._process = psutil.Process()
+        except ImportError:
+            # psutil not available, memory checks are skipped
+            self._process = None
 
     def check_memory_usage(self) -> bool:
         """Check if memory usage is within limits."""
@@ -707,11 +932,11 @@ class MemoryManager:
         if now - self.last_check < self.check_interval:
             return True
 
-        try:
-            import psutil
+        if self._process is None:
+            return True
 
-            process = psutil.Process()
-            memory_usage = process.memory_info().rss
+        try:
+            memory_usage = self._process.memory_info().rss
 
             if memory_usage > self.max_memory_bytes:
                 logger.warning(f"Memory usage {memory_usage / 1024 / 1024:.1f}MB exceeds limit")
@@ -719,9 +944,6 @@ class MemoryManager:
 
             self.last_check = now
             return True
-        except ImportError:
-            # psutil not available, skip check
-            return True
         except Exception as e:
             logger.error(f"Memory check failed: {e}")
             return True
@@ -6,31 +6,43 @@ Production-ready with Streamable HTTP and legacy SSE transport, authentication,
 """
 
 import asyncio
+import gc
+import hmac
 import json
 import logging
 import os
-import threading
-import uuid
+import secrets
+import time
+from collections import OrderedDict
 from contextlib import asynccontextmanager
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Union
+from datetime import datetime, timezone
+from functools import lru_cache
+from string import Template
+from typing import Any, Awaitable, Callable, Dict, Final, List, NamedTuple, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 from fastapi import FastAPI, Header, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, StreamingResponse
-from pydantic import BaseModel, Field, ValidationError
 
 from wazuh_mcp_server import __version__
 from wazuh_mcp_server.api.wazuh_client import WazuhClient
 from wazuh_mcp_server.api.wazuh_indexer import IndexerNotConfiguredError
-from wazuh_mcp_server.auth import create_access_token
+from wazuh_mcp_server.auth import auth_manager, create_access_token, verify_bearer_token
 from wazuh_mcp_server.config import WazuhConfig, get_config
-from wazuh_mcp_server.monitoring import ACTIVE_CONNECTIONS, REQUEST_COUNT
-from wazuh_mcp_server.resilience import GracefulShutdown
+from wazuh_mcp_server.monitoring import (
+    ACTIVE_CONNECTIONS,
+    REQUEST_COUNT,
+    get_correlation_id,
+    record_tool_execution,
+    structured_logger,
+)
+from wazuh_mcp_server.resilience import graceful_shutdown
 from wazuh_mcp_server.security import (
     RateLimiter,
+    SanitizingLogFilter,
     ToolValidationError,
+    connection_pool_manager,
     validate_agent_id,
     validate_agent_status,
     validate_boolean,
@@ -48,18 +60,55 @@ from wazuh_mcp_server.security import (
 )
 from wazuh_mcp_server.session_store import SessionStore, create_session_store
 
+try:
+    import orjson
+except ImportError:  # Optional accelerator; responses fall back to stdlib json
+    orjson = None
+
 # MCP Protocol Version Support
 # Latest: 2025-11-25, also supports backwards compatibility with older versions
 MCP_PROTOCOL_VERSION = "2025-11-25"
 SUPPORTED_PROTOCOL_VERSIONS = ["2025-11-25", "2025-06-18", "2025-03-26", "2024-11-05"]
+# Membership set and error-message text, derived once from the ordered list above
+SUPPORTED_PROTOCOL_VERSION_SET = frozenset(SUPPORTED_PROTOCOL_VERSIONS)
+SUPPORTED_PROTOCOL_VERSIONS_STR = ", ".join(SUPPORTED_PROTOCOL_VERSIONS)
 
 # Production Constants
 SESSION_TIMEOUT_MINUTES = 30
+SESSION_ACTIVITY_FLUSH_SECONDS = 5
+SESSION_CLEANUP_INTERVAL_SECONDS = 60
 RATE_LIMIT_REQUESTS = 100
 RATE_LIMIT_WINDOW_SECONDS = 60
 CORS_MAX_AGE_SECONDS = 600
 DEFAULT_QUERY_LIMIT = 100
 MAX_QUERY_LIMIT = 1000
+MAX_BATCH_SIZE = 20
+COMPACT_OFFLOAD_THRESHOLD = 200  # Items above which compaction runs in a worker thread
+RESOURCE_CACHE_TTL_SECONDS = 5
+
+
+class MCPJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when the optional extra is installed."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            try:
+                return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+            except orjson.JSONEncodeError:
+                pass  # e.g. integers wider than 64 bits, which only the stdlib encoder accepts
+        return super().render(content)
+
+
+def _dump_json(obj: Any, pretty: bool = True) -> str:
+    """Serialize a tool or resource result to text, with orjson when the optional extra is installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2 if pretty else orjson.OPT_NON_STR_KEYS
+        try:
+            return orjson.dumps(obj, option=option).decode()
+        except TypeError:
+            pass  # e.g. integers wider than 64 bits, which only the stdlib encoder accepts
+    return json.dumps(obj, indent=2 if pretty else None)
+
 
 logger = logging.getLogger(__name__)
 
@@ -88,7 +137,7 @@ async def verify_authentication(authorization: Optional[str], config) -> bool:
     if config.is_oauth:
         global _oauth_manager
         if _oauth_manager:
-            token = authorization.replace("Bearer ", "") if authorization.startswith("Bearer ") else authorization
+            token = authorization[7:] if authorization.startswith("Bearer ") else authorization
             token_obj = _oauth_manager.validate_access_token(token)
             if token_obj:
                 return True
@@ -98,8 +147,6 @@ async def verify_authentication(authorization: Optional[str], config) -> bool:
 
     # Bearer token mode (default)
     try:
-        from wazuh_mcp_server.auth import verify_bearer_token
-
         await verify_bearer_token(authorization)
         return True
     except ValueError as e:
@@ -107,57 +154,37 @@ async def verify_authentication(authorization: Optional[str], config) -> bool:
 
 
 # MCP Protocol Models
-class MCPRequest(BaseModel):
+class MCPRequest(NamedTuple):
     """MCP JSON-RPC 2.0 Request."""
 
-    jsonrpc: str = Field(default="2.0", description="JSON-RPC version")
-    id: Optional[Union[str, int]] = Field(default=None, description="Request ID")
-    method: str = Field(description="Method name")
-    params: Optional[Dict[str, Any]] = Field(default=None, description="Method parameters")
-
-
-class MCPResponse(BaseModel):
-    """
-    MCP JSON-RPC 2.0 Response.
-
-    Compliant with JSON-RPC 2.0 specification:
-    - On success: includes 'result', excludes 'error'
-    - On error: includes 'error', excludes 'result'
-    """
-
-    jsonrpc: str = Field(default="2.0", description="JSON-RPC version")
-    id: Optional[Union[str, int]] = Field(default=None, description="Request ID")
-    result: Optional[Any] = Field(default=None, description="Result data")
-    error: Optional[Dict[str, Any]] = Field(default=None, description="Error object")
+    method: str
+    id: Optional[Union[str, int]] = None
+    params: Optional[Dict[str, Any]] = None
+    jsonrpc: str = "2.0"
 
-    def dict(self, *args, **kwargs) -> Dict[str, Any]:
-        """
-        Override dict() to comply with JSON-RPC 2.0 specification.
+    @classmethod
+    def from_dict(cls, message: Any) -> "MCPRequest":
+        """Validate a decoded JSON-RPC request. Raises ValueError if it is malformed."""
+        if not isinstance(message, dict):
+            raise ValueError("request must be a JSON object")
 
-        Per JSON-RPC 2.0 spec:
-        - "result" and "error" MUST NOT both exist in the same response
-        - On success: include 'result', exclude 'error'
-        - On error: include 'error', exclude 'result'
-        """
-        d = super().dict(*args, **kwargs)
+        method = message.get("method")
+        if not isinstance(method, str):
+            raise ValueError("'method' must be a string")
 
-        # Remove error field on success (when result is present and error is None)
-        if d.get("result") is not None and d.get("error") is None:
-            d.pop("error", None)
+        request_id = message.get("id")
+        if request_id is not None and (isinstance(request_id, bool) or not isinstance(request_id, (str, int))):
+            raise ValueError("'id' must be a string, an integer or null")
 
-        # Remove result field on error (when error is present)
-        elif d.get("error") is not None:
-            d.pop("result", None)
+        params = message.get("params")
+        if params is not None and not isinstance(params, dict):
+            raise ValueError("'params' must be an object")
 
-        return d
+        jsonrpc = message.get("jsonrpc", "2.0")
+        if not isinstance(jsonrpc, str):
+            raise ValueError("'jsonrpc' must be a string")
 
-
-class MCPError(BaseModel):
-    """MCP JSON-RPC 2.0 Error object."""
-
-    code: int = Field(description="Error code")
-    message: str = Field(description="Error message")
-    data: Optional[Any] = Field(default=None, description="Additional error data")
+        return cls(method, request_id, params, jsonrpc)
 
 
 class MCPSession:
@@ -166,20 +193,43 @@ class MCPSession:
     def __init__(self, session_id: str, origin: Optional[str] = None):
         self.session_id = session_id
         self.origin = origin
-        self.created_at = datetime.now(timezone.utc)
-        self.last_activity = self.created_at
+        # Activity is tracked on the monotonic clock; wall-clock times are derived
+        # from the creation epoch only when the session is serialized.
+        self._created_ts = time.time()
+        self._created_mono = time.monotonic()
+        self._last_activity_mono = self._created_mono
         self.capabilities = {}
         self.client_info = {}
         self.authenticated = False
 
+    @property
+    def created_at(self) -> datetime:
+        """Wall-clock creation time."""
+        return datetime.fromtimestamp(self._created_ts, tz=timezone.utc)
+
+    @property
+    def last_activity_ts(self) -> float:
+        """Epoch seconds of the last activity."""
+        return self._created_ts + (self._last_activity_mono - self._created_mono)
+
+    @property
+    def last_activity(self) -> datetime:
+        """Wall-clock time of the last activity."""
+        return datetime.fromtimestamp(self.last_activity_ts, tz=timezone.utc)
+
+    def restore_timestamps(self, created_ts: float, last_activity_ts: float) -> None:
+        """Re-anchor persisted epoch timestamps onto the monotonic clock."""
+        self._created_ts = created_ts
+        self._created_mono = time.monotonic() - (time.time() - created_ts)
+        self._last_activity_mono = self._created_mono + (last_activity_ts - created_ts)
+
     def update_activity(self) -> None:
         """Update last activity timestamp."""
-        self.last_activity = datetime.now(timezone.utc)
+        self._last_activity_mono = time.monotonic()
 
     def is_expired(self, timeout_minutes: int = SESSION_TIMEOUT_MINUTES) -> bool:
         """Check if session is expired."""
-        timeout = timedelta(minutes=timeout_minutes)
-        return datetime.now(timezone.utc) - self.last_activity > timeout
+        return time.monotonic() - self._last_activity_mono > timeout_minutes * 60
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert session to dictionary."""
@@ -193,6 +243,25 @@ class MCPSession:
             "authenticated": self.authenticated,
         }
 
+    def to_record(self) -> Dict[str, Any]:
+        """Convert session to its storage form, with timestamps as epoch seconds."""
+        return {
+            "session_id": self.session_id,
+            "origin": self.origin,
+            "created_at": self._created_ts,
+            "last_activity": self.last_activity_ts,
+            "capabilities": self.capabilities,
+            "client_info": self.client_info,
+            "authenticated": self.authenticated,
+        }
+
+
+def _epoch_seconds(value: Union[float, str]) -> float:
+    """Read a stored session timestamp; records written before epoch storage hold ISO strings."""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    return value
+
 
 # Session management with pluggable backend (serverless-ready)
 class SessionManager:
@@ -203,14 +272,16 @@ class SessionManager:
 
     def __init__(self, store: SessionStore):
         self._store = store
-        self._lock = threading.RLock()  # For synchronous operations
+        # Monotonic time of the last write per session in write order, used to coalesce
+        # activity updates. Entries older than the flush interval carry no information
+        # and are pruned from the head.
+        self._flushed: "OrderedDict[str, float]" = OrderedDict()
         logger.info(f"SessionManager initialized with {type(store).__name__}")
 
     def _session_from_dict(self, data: Dict[str, Any]) -> MCPSession:
         """Reconstruct MCPSession from dictionary."""
         session = MCPSession(data["session_id"], data.get("origin"))
-        session.created_at = datetime.fromisoformat(data["created_at"].replace("Z", "+00:00"))
-        session.last_activity = datetime.fromisoformat(data["last_activity"].replace("Z", "+00:00"))
+        session.restore_timestamps(_epoch_seconds(data["created_at"]), _epoch_seconds(data["last_activity"]))
         session.capabilities = data.get("capabilities", {})
         session.client_info = data.get("client_info", {})
         session.authenticated = data.get("authenticated", False)
@@ -225,75 +296,39 @@ class SessionManager:
 
     async def set(self, session_id: str, session: MCPSession) -> bool:
         """Store session."""
-        return await self._store.set(session_id, session.to_dict())
-
-    def _run_sync(self, coro):
-        """Run coroutine synchronously, handling existing event loop safely."""
-        try:
-            # Check if we're in an async context
-            loop = asyncio.get_running_loop()
-            # If we get here, there's a running loop - this is not safe
-            raise RuntimeError(
-                "Synchronous SessionManager methods cannot be called from async context. "
-                "Use async methods like 'await sessions.get()' instead."
-            )
-        except RuntimeError:
-            # No running loop - safe to create one
-            loop = asyncio.new_event_loop()
-            try:
-                return loop.run_until_complete(coro)
-            finally:
-                loop.close()
-
-    def __getitem__(self, session_id: str) -> MCPSession:
-        """Synchronous dict-like access (blocks). Not for use in async context."""
-        session = self._run_sync(self.get(session_id))
-        if session is None:
-            raise KeyError(f"Session {session_id} not found")
-        return session
-
-    def __setitem__(self, session_id: str, session: MCPSession) -> None:
-        """Synchronous dict-like access (blocks). Not for use in async context."""
-        self._run_sync(self.set(session_id, session))
-
-    def __delitem__(self, session_id: str) -> None:
-        """Synchronous delete (blocks). Not for use in async context."""
-        self._run_sync(self.remove(session_id))
-
-    async def __contains__(self, session_id: str) -> bool:
+        self._mark_flushed(session_id, time.monotonic())
+        return await self._store.set(session_id, session.to_record())
+
+    def _mark_flushed(self, session_id: str, now: float) -> None:
+        self._flushed[session_id] = now
+        self._flushed.move_to_end(session_id)
+        cutoff = now - SESSION_ACTIVITY_FLUSH_SECONDS
+        while next(iter(self._flushed.values())) <= cutoff:
+            self._flushed.popitem(last=False)
+
+    async def touch(self, session: MCPSession) -> bool:
+        """Persist session activity, at most once per SESSION_ACTIVITY_FLUSH_SECONDS."""
+        now = time.monotonic()
+        last = self._flushed.get(session.session_id)
+        if last is not None and now - last < SESSION_ACTIVITY_FLUSH_SECONDS:
+            return True
+        self._mark_flushed(session.session_id, now)
+        return await self._store.touch(session.session_id, session.last_activity_ts)
+
+    async def exists(self, session_id: str) -> bool:
         """Check if session exists."""
         return await self._store.exists(session_id)
 
     async def remove(self, session_id: str) -> bool:
         """Remove session by ID."""
+        self._flushed.pop(session_id, None)
         return await self._store.delete(session_id)
 
-    def pop(self, session_id: str, default=None) -> Optional[MCPSession]:
-        """Remove and return session (synchronous, blocks). Not for use in async context."""
-
-        async def _pop():
-            session = await self.get(session_id)
-            if session:
-                await self.remove(session_id)
-                return session
-            return default
-
-        return self._run_sync(_pop())
-
     async def clear(self) -> bool:
         """Clear all sessions."""
+        self._flushed.clear()
         return await self._store.clear()
 
-    def values(self) -> List[MCPSession]:
-        """Get all session values (synchronous, blocks). Not for use in async context."""
-        sessions_dict = self._run_sync(self.get_all())
-        return list(sessions_dict.values())
-
-    def keys(self) -> List[str]:
-        """Get all session keys (synchronous, blocks). Not for use in async context."""
-        sessions_dict = self._run_sync(self.get_all())
-        return list(sessions_dict.keys())
-
     async def get_all(self) -> Dict[str, MCPSession]:
         """Get all sessions as dictionary."""
         data_dict = await self._store.get_all()
@@ -316,28 +351,31 @@ async def get_or_create_session(session_id: Optional[str], origin: Optional[str]
         existing_session = await sessions.get(session_id)
         if existing_session:
             existing_session.update_activity()
-            await sessions.set(session_id, existing_session)
+            await sessions.touch(existing_session)
             return existing_session
 
     # Create new session
-    new_session_id = session_id or str(uuid.uuid4())
+    new_session_id = session_id or secrets.token_hex(16)
     session = MCPSession(new_session_id, origin)
     await sessions.set(new_session_id, session)
+    return session
 
-    # Cleanup expired sessions periodically
-    try:
-        expired_count = await sessions.cleanup_expired()
-        if expired_count > 0:
-            logger.debug(f"Cleaned up {expired_count} expired sessions")
-            # Sync _initialized_sessions with active sessions
-            active = await sessions.get_all()
-            stale_keys = [k for k in _initialized_sessions if k not in active]
-            for k in stale_keys:
-                _initialized_sessions.pop(k, None)
-    except Exception as e:
-        logger.error(f"Session cleanup error: {e}")
 
-    return session
+async def _session_cleanup_loop() -> None:
+    """Remove expired sessions every SESSION_CLEANUP_INTERVAL_SECONDS, off the request path."""
+    while True:
+        await asyncio.sleep(SESSION_CLEANUP_INTERVAL_SECONDS)
+        try:
+            expired_count = await sessions.cleanup_expired()
+            if expired_count > 0:
+                logger.debug(f"Cleaned up {expired_count} expired sessions")
+                # Sync _initialized_sessions with active sessions
+                active = await sessions.get_all()
+                stale_keys = [k for k in _initialized_sessions if k not in active]
+                for k in stale_keys:
+                    _initialized_sessions.pop(k, None)
+        except Exception as e:
+            logger.error(f"Session cleanup error: {e}")
 
 
 # Lifespan context manager for startup/shutdown events (modern FastAPI pattern)
@@ -346,20 +384,19 @@ async def lifespan(app: FastAPI):
     """Manage application lifecycle with proper startup and shutdown handling."""
     global _oauth_manager
 
+    cfg = get_config()
+
     # === STARTUP ===
     # Attach log sanitization filter to prevent credential leakage
-    from wazuh_mcp_server.security import SanitizingLogFilter
-
     logging.getLogger().addFilter(SanitizingLogFilter())
 
     logger.info(f"Wazuh MCP Server v{__version__} starting up...")
     logger.info(f"📡 MCP Protocol: {MCP_PROTOCOL_VERSION}")
-    logger.info(f"🔗 Wazuh Host: {get_config().WAZUH_HOST}")
-    logger.info(f"🌐 CORS Origins: {get_config().ALLOWED_ORIGINS}")
-    logger.info(f"🔐 Auth Mode: {get_config().AUTH_MODE}")
+    logger.info(f"🔗 Wazuh Host: {cfg.WAZUH_HOST}")
+    logger.info(f"🌐 CORS Origins: {cfg.ALLOWED_ORIGINS}")
+    logger.info(f"🔐 Auth Mode: {cfg.AUTH_MODE}")
 
     # Log Indexer configuration status
-    cfg = get_config()
     if cfg.WAZUH_INDEXER_HOST:
         logger.info(f"📊 Wazuh Indexer: {cfg.WAZUH_INDEXER_HOST}:{cfg.WAZUH_INDEXER_PORT}")
     else:
@@ -387,8 +424,6 @@ async def lifespan(app: FastAPI):
         logger.info("🔐 Bearer token authentication enabled")
         # Display auto-generated API key if not configured via environment
         if not os.getenv("MCP_API_KEY"):
-            from wazuh_mcp_server.auth import auth_manager
-
             default_key = auth_manager.get_default_api_key()
             if default_key:
                 logger.info("=" * 60)
@@ -397,21 +432,32 @@ async def lifespan(app: FastAPI):
                 logger.info("   Set MCP_API_KEY environment variable in production")
                 logger.info("=" * 60)
 
+    session_cleanup_task = asyncio.create_task(_session_cleanup_loop())
+
     # Initialize Wazuh client (will be available after yield)
     logger.info("✅ Server startup complete with high availability features enabled")
 
+    # Move config, clients and other startup singletons into the permanent
+    # generation so request-time collections don't keep rescanning them.
+    gc.collect()
+    gc.freeze()
+
     yield  # Server is running
 
     # === SHUTDOWN ===
     logger.info("🛑 Wazuh MCP Server initiating graceful shutdown...")
 
+    session_cleanup_task.cancel()
+    try:
+        await session_cleanup_task
+    except asyncio.CancelledError:
+        pass
+
     try:
         # Initiate graceful shutdown (waits for active connections)
         await shutdown_manager.initiate_shutdown()
 
         # Clear and cleanup auth manager
-        from wazuh_mcp_server.auth import auth_manager
-
         auth_manager.cleanup_expired()
         auth_manager.tokens.clear()
         logger.info("Authentication tokens cleared")
@@ -433,14 +479,11 @@ async def lifespan(app: FastAPI):
             rate_limiter.cleanup()
 
         # Close connection pools
-        from wazuh_mcp_server.security import connection_pool_manager
-
         await connection_pool_manager.close_all()
         logger.info("Connection pools closed")
 
         # Force garbage collection
-        import gc
-
+        gc.unfreeze()
         gc.collect()
         logger.info("Garbage collection completed")
 
@@ -458,6 +501,7 @@ app = FastAPI(
     docs_url="/docs",
     openapi_url="/openapi.json",
     lifespan=lifespan,
+    default_response_class=MCPJSONResponse,
 )
 
 # Get configuration
@@ -493,7 +537,7 @@ async def get_wazuh_client() -> WazuhClient:
 rate_limiter = RateLimiter(max_requests=RATE_LIMIT_REQUESTS, window_seconds=RATE_LIMIT_WINDOW_SECONDS)
 
 # Initialize graceful shutdown manager
-shutdown_manager = GracefulShutdown()
+shutdown_manager = graceful_shutdown
 logger.info("Graceful shutdown manager initialized")
 
 
@@ -528,6 +572,27 @@ def validate_cors_origins(origins_config: str) -> List[str]:
     return origins if origins else ["https://claude.ai"]
 
 
+class _OriginRules(NamedTuple):
+    """Parsed form of an ALLOWED_ORIGINS setting."""
+
+    allow_all: bool
+    exact: frozenset
+    suffixes: tuple
+    allow_localhost: bool
+
+
+@lru_cache(maxsize=8)
+def _parse_origin_rules(allowed_origins_config: str) -> _OriginRules:
+    """Parse a comma-separated origin list once; the setting is fixed for the process lifetime."""
+    entries = [allowed.strip() for allowed in allowed_origins_config.split(",")] if allowed_origins_config else []
+    return _OriginRules(
+        allow_all="*" in entries,
+        exact=frozenset(entries),
+        suffixes=tuple(allowed[1:] for allowed in entries if allowed.startswith("*")),
+        allow_localhost=any("localhost" in allowed for allowed in entries),
+    )
+
+
 def validate_origin_header(origin: Optional[str], allowed_origins_config: str) -> None:
     """
     Validate Origin header per MCP 2025-11-25 spec.
@@ -550,20 +615,13 @@ def validate_origin_header(origin: Optional[str], allowed_origins_config: str) -
     if not origin:
         return  # No Origin header = acceptable
 
-    # Parse allowed origins
-    allowed_origins_list = allowed_origins_config.split(",") if allowed_origins_config else []
-
-    # Check if origin is allowed
-    for allowed in allowed_origins_list:
-        allowed = allowed.strip()
-        if allowed == "*":
-            return  # Wildcard allows everything
-        if allowed == origin:
-            return  # Exact match
-        if allowed.startswith("*") and origin.endswith(allowed[1:]):
-            return  # Wildcard suffix match
-        if "localhost" in allowed and "localhost" in origin:
-            return  # Localhost match (for development)
+    rules = _parse_origin_rules(allowed_origins_config)
+    if rules.allow_all or origin in rules.exact:
+        return  # Wildcard or exact match
+    if rules.suffixes and origin.endswith(rules.suffixes):
+        return  # Wildcard suffix match
+    if rules.allow_localhost and "localhost" in origin:
+        return  # Localhost match (for development)
 
     # Origin present but not in allowed list - per spec MUST return 403
     raise HTTPException(status_code=403, detail=f"Origin not allowed: {origin}")
@@ -592,37 +650,44 @@ app.add_middleware(
 )
 
 # MCP Protocol Error Codes
+PARSE_ERROR: Final = -32700
+INVALID_REQUEST: Final = -32600
+METHOD_NOT_FOUND: Final = -32601
+INVALID_PARAMS: Final = -32602
+INTERNAL_ERROR: Final = -32603
+TIMEOUT: Final = -32001
+CANCELLED: Final = -32002
+RESOURCE_NOT_FOUND: Final = -32003
+
 MCP_ERRORS = {
-    "PARSE_ERROR": -32700,
-    "INVALID_REQUEST": -32600,
-    "METHOD_NOT_FOUND": -32601,
-    "INVALID_PARAMS": -32602,
-    "INTERNAL_ERROR": -32603,
-    "TIMEOUT": -32001,
-    "CANCELLED": -32002,
-    "RESOURCE_NOT_FOUND": -32003,
+    "PARSE_ERROR": PARSE_ERROR,
+    "INVALID_REQUEST": INVALID_REQUEST,
+    "METHOD_NOT_FOUND": METHOD_NOT_FOUND,
+    "INVALID_PARAMS": INVALID_PARAMS,
+    "INTERNAL_ERROR": INTERNAL_ERROR,
+    "TIMEOUT": TIMEOUT,
+    "CANCELLED": CANCELLED,
+    "RESOURCE_NOT_FOUND": RESOURCE_NOT_FOUND,
 }
 
 
 def create_error_response(
     request_id: Optional[Union[str, int]], code: int, message: str, data: Any = None
-) -> MCPResponse:
+) -> Dict[str, Any]:
     """Create MCP error response with correlation ID for tracing."""
-    from wazuh_mcp_server.monitoring import get_correlation_id
-
     # Include correlation ID in error data for request tracing
     error_data = data if data else {}
     if isinstance(error_data, dict):
         error_data = {**error_data, "correlation_id": get_correlation_id()}
     elif data is None:
         error_data = {"correlation_id": get_correlation_id()}
-    error = MCPError(code=code, message=message, data=error_data)
-    return MCPResponse(id=request_id, error=error.dict())
+    # Per JSON-RPC 2.0, "result" and "error" never appear in the same response
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message, "data": error_data}}
 
 
-def create_success_response(request_id: Optional[Union[str, int]], result: Any) -> MCPResponse:
+def create_success_response(request_id: Optional[Union[str, int]], result: Any) -> Dict[str, Any]:
     """Create MCP success response."""
-    return MCPResponse(id=request_id, result=result)
+    return {"jsonrpc": "2.0", "id": request_id, "result": result}
 
 
 def validate_protocol_version(version: Optional[str], strict: bool = False) -> str:
@@ -644,7 +709,7 @@ def validate_protocol_version(version: Optional[str], strict: bool = False) -> s
         # Per spec: assume 2025-03-26 if no header provided (backwards compatibility)
         return "2025-03-26"
 
-    if version in SUPPORTED_PROTOCOL_VERSIONS:
+    if version in SUPPORTED_PROTOCOL_VERSION_SET:
         return version
 
     # Per 2025-11-25 spec: "If the server receives a request with an invalid or
@@ -652,7 +717,7 @@ def validate_protocol_version(version: Optional[str], strict: bool = False) -> s
     if strict:
         raise HTTPException(
             status_code=400,
-            detail=f"Unsupported protocol version: {version}. Supported versions: {', '.join(SUPPORTED_PROTOCOL_VERSIONS)}",
+            detail=f"Unsupported protocol version: {version}. Supported versions: {SUPPORTED_PROTOCOL_VERSIONS_STR}",
         )
 
     # For backwards compatibility (non-strict mode), try to handle gracefully
@@ -661,7 +726,18 @@ def validate_protocol_version(version: Optional[str], strict: bool = False) -> s
 
 
 # Track initialized sessions (for notifications/initialized handling)
-_initialized_sessions: Dict[str, bool] = {}
+# Bounded in update order so churned sessions cannot grow it without limit
+_initialized_sessions: "OrderedDict[str, bool]" = OrderedDict()
+MAX_INITIALIZED_SESSIONS = 100_000
+
+
+def _set_initialized(session_id: str, initialized: bool) -> None:
+    """Record a session's initialization state, evicting the oldest entries above the cap."""
+    _initialized_sessions[session_id] = initialized
+    _initialized_sessions.move_to_end(session_id)
+    while len(_initialized_sessions) > MAX_INITIALIZED_SESSIONS:
+        _initialized_sessions.popitem(last=False)
+
 
 # Current log level for logging/setLevel
 _current_log_level: str = "info"
@@ -675,30 +751,26 @@ def _compact_alert(alert: dict) -> dict:
     compact = {}
     if "timestamp" in alert:
         compact["timestamp"] = alert["timestamp"]
-    agent = alert.get("agent", {})
-    if agent:
+    if agent := alert.get("agent"):
         compact["agent"] = {"id": agent.get("id", ""), "name": agent.get("name", "")}
-    rule = alert.get("rule", {})
-    if rule:
-        compact["rule"] = {
+    if rule := alert.get("rule"):
+        compact_rule = compact["rule"] = {
             "id": rule.get("id", ""),
             "level": rule.get("level", 0),
             "description": rule.get("description", ""),
             "groups": rule.get("groups", []),
         }
-        if rule.get("mitre"):
-            compact["rule"]["mitre"] = rule["mitre"]
-    src = alert.get("data", {})
-    if src.get("srcip"):
-        compact["srcip"] = src["srcip"]
-    if src.get("dstip"):
-        compact["dstip"] = src["dstip"]
-    if alert.get("syscheck"):
-        sc = alert["syscheck"]
+        if mitre := rule.get("mitre"):
+            compact_rule["mitre"] = mitre
+    if src := alert.get("data"):
+        if srcip := src.get("srcip"):
+            compact["srcip"] = srcip
+        if dstip := src.get("dstip"):
+            compact["dstip"] = dstip
+    if sc := alert.get("syscheck"):
         compact["syscheck"] = {"path": sc.get("path", ""), "event": sc.get("event", "")}
-    if alert.get("full_log"):
-        log = alert["full_log"]
-        compact["full_log"] = (log[:300] + "...") if len(log) > 300 else log
+    if log := alert.get("full_log"):
+        compact["full_log"] = log if len(log) <= 300 else log[:300] + "..."
     return compact
 
 
@@ -706,26 +778,25 @@ def _compact_alerts_result(result: dict) -> dict:
     """Apply compaction to a standard alerts result dict."""
     data = result.get("data", {})
     items = data.get("affected_items", [])
-    data["affected_items"] = [_compact_alert(a) for a in items]
+    data["affected_items"] = list(map(_compact_alert, items))
     return result
 
 
 def _compact_vulnerability(vuln: dict) -> dict:
     """Strip a raw Wazuh vulnerability to essential fields for MCP output."""
     compact = {}
-    for key in ("id", "severity"):
-        if key in vuln:
-            compact[key] = vuln[key]
+    if "id" in vuln:
+        compact["id"] = vuln["id"]
+    if "severity" in vuln:
+        compact["severity"] = vuln["severity"]
     if "description" in vuln:
         desc = vuln["description"]
-        compact["description"] = (desc[:120] + "...") if len(desc) > 120 else desc
+        compact["description"] = desc if len(desc) <= 120 else desc[:120] + "..."
     if "published_at" in vuln:
         compact["published_at"] = vuln["published_at"]
-    pkg = vuln.get("package", {})
-    if pkg:
+    if pkg := vuln.get("package"):
         compact["package"] = {"name": pkg.get("name", ""), "version": pkg.get("version", "")}
-    agent = vuln.get("agent", {})
-    if agent:
+    if agent := vuln.get("agent"):
         compact["agent"] = {"id": agent.get("id", ""), "name": agent.get("name", "")}
     return compact
 
@@ -735,10 +806,18 @@ def _compact_vulns_result(result: dict) -> dict:
     data = result.get("data", {})
     items = data.get("affected_items", [])
     if items:
-        data["affected_items"] = [_compact_vulnerability(v) for v in items]
+        data["affected_items"] = list(map(_compact_vulnerability, items))
     return result
 
 
+async def _compact_offloaded(compactor, result: dict) -> dict:
+    """Apply a result compactor, moving large result sets off the event loop."""
+    items = result.get("data", {}).get("affected_items")
+    if items and len(items) >= COMPACT_OFFLOAD_THRESHOLD:
+        return await asyncio.to_thread(compactor, result)
+    return compactor(result)
+
+
 async def handle_initialize(params: Dict[str, Any], session: MCPSession) -> Dict[str, Any]:
     """Handle MCP initialize method per MCP specification."""
     client_protocol_version = params.get("protocolVersion", "2025-03-26")
@@ -751,7 +830,7 @@ async def handle_initialize(params: Dict[str, Any], session: MCPSession) -> Dict
 
     # Protocol version negotiation per MCP spec
     # Server should respond with a version it supports
-    if client_protocol_version in SUPPORTED_PROTOCOL_VERSIONS:
+    if client_protocol_version in SUPPORTED_PROTOCOL_VERSION_SET:
         negotiated_version = client_protocol_version
     else:
         # Default to latest supported version
@@ -774,7 +853,7 @@ async def handle_initialize(params: Dict[str, Any], session: MCPSession) -> Dict
     }
 
     # Mark session as awaiting initialized notification
-    _initialized_sessions[session.session_id] = False
+    _set_initialized(session.session_id, False)
 
     return {
         "protocolVersion": negotiated_version,
@@ -786,7 +865,7 @@ async def handle_initialize(params: Dict[str, Any], session: MCPSession) -> Dict
 
 async def handle_initialized_notification(params: Dict[str, Any], session: MCPSession) -> None:
     """Handle notifications/initialized - marks session as fully initialized."""
-    _initialized_sessions[session.session_id] = True
+    _set_initialized(session.session_id, True)
     logger.info(f"Session {session.session_id} fully initialized")
 
 
@@ -816,76 +895,158 @@ async def handle_logging_set_level(params: Dict[str, Any], session: MCPSession)
     return {}
 
 
+MCP_PROMPTS = [
+    {
+        "name": "security_investigation",
+        "description": "Investigate a security incident using Wazuh data",
+        "arguments": [
+            {
+                "name": "incident_type",
+                "description": "Type of incident to investigate (e.g., malware, intrusion, data_breach)",
+                "required": True,
+            },
+            {
+                "name": "time_range",
+                "description": "Time range for investigation (e.g., 1h, 24h, 7d)",
+                "required": False,
+            },
+        ],
+    },
+    {
+        "name": "threat_hunt",
+        "description": "Perform proactive threat hunting across Wazuh agents",
+        "arguments": [
+            {"name": "hunt_hypothesis", "description": "The threat hypothesis to investigate", "required": True},
+            {
+                "name": "agent_scope",
+                "description": "Scope of agents to hunt (all, critical, specific)",
+                "required": False,
+            },
+        ],
+    },
+    {
+        "name": "compliance_audit",
+        "description": "Generate compliance audit report for a specific framework",
+        "arguments": [
+            {
+                "name": "framework",
+                "description": "Compliance framework (PCI-DSS, HIPAA, SOX, GDPR, NIST)",
+                "required": True,
+            },
+            {
+                "name": "include_remediation",
+                "description": "Include remediation recommendations",
+                "required": False,
+            },
+        ],
+    },
+    {
+        "name": "vulnerability_assessment",
+        "description": "Assess vulnerabilities across the environment",
+        "arguments": [
+            {
+                "name": "severity_threshold",
+                "description": "Minimum severity to include (low, medium, high, critical)",
+                "required": False,
+            },
+            {"name": "agent_id", "description": "Specific agent to assess (optional)", "required": False},
+        ],
+    },
+]
+
+_PROMPTS_LIST_RESPONSE = {"prompts": MCP_PROMPTS, "nextCursor": None}
+
+
 async def handle_prompts_list(params: Dict[str, Any], session: MCPSession) -> Dict[str, Any]:
     """
     Handle prompts/list method per MCP specification.
     Returns list of available prompts with pagination support.
     """
-    _cursor = params.get("cursor")  # Reserved for future pagination
-
-    # Wazuh security prompts
-    prompts = [
-        {
-            "name": "security_investigation",
-            "description": "Investigate a security incident using Wazuh data",
-            "arguments": [
-                {
-                    "name": "incident_type",
-                    "description": "Type of incident to investigate (e.g., malware, intrusion, data_breach)",
-                    "required": True,
-                },
-                {
-                    "name": "time_range",
-                    "description": "Time range for investigation (e.g., 1h, 24h, 7d)",
-                    "required": False,
-                },
-            ],
-        },
-        {
-            "name": "threat_hunt",
-            "description": "Perform proactive threat hunting across Wazuh agents",
-            "arguments": [
-                {"name": "hunt_hypothesis", "description": "The threat hypothesis to investigate", "required": True},
-                {
-                    "name": "agent_scope",
-                    "description": "Scope of agents to hunt (all, critical, specific)",
-                    "required": False,
-                },
-            ],
-        },
-        {
-            "name": "compliance_audit",
-            "description": "Generate compliance audit report for a specific framework",
-            "arguments": [
-                {
-                    "name": "framework",
-                    "description": "Compliance framework (PCI-DSS, HIPAA, SOX, GDPR, NIST)",
-                    "required": True,
-                },
-                {
-                    "name": "include_remediation",
-                    "description": "Include remediation recommendations",
-                    "required": False,
-                },
-            ],
-        },
-        {
-            "name": "vulnerability_assessment",
-            "description": "Assess vulnerabilities across the environment",
-            "arguments": [
-                {
-                    "name": "severity_threshold",
-                    "description": "Minimum severity to include (low, medium, high, critical)",
-                    "required": False,
-                },
-                {"name": "agent_id", "description": "Specific agent to assess (optional)", "required": False},
-            ],
-        },
-    ]
+    # Static catalogue, served from a single page built at import
+    return _PROMPTS_LIST_RESPONSE
+
+
+class _PromptTemplate(NamedTuple):
+    """A prompts/get workflow: description, message template and argument defaults."""
+
+    description: str
+    template: Template
+    defaults: Dict[str, str]
+
+
+# Compiled once; prompts/get only renders the template that was asked for
+_PROMPT_TEMPLATES: Final = {
+    "security_investigation": _PromptTemplate(
+        "Security incident investigation workflow",
+        Template(
+            "Investigate a $incident_type incident. "
+            "Time range: $time_range. "
+            "Steps:\n"
+            "1. Use get_wazuh_alerts to retrieve relevant alerts\n"
+            "2. Use analyze_alert_patterns to identify patterns\n"
+            "3. Use search_security_events to find related events\n"
+            "4. Use check_agent_health for affected agents\n"
+            "5. Use perform_risk_assessment to evaluate impact"
+        ),
+        {"incident_type": "security", "time_range": "24h"},
+    ),
+    "threat_hunt": _PromptTemplate(
+        "Proactive threat hunting workflow",
+        Template(
+            "Hunt for threats based on hypothesis: $hunt_hypothesis. "
+            "Agent scope: $agent_scope. "
+            "Workflow:\n"
+            "1. Use get_wazuh_agents to identify target agents\n"
+            "2. Use search_security_events with relevant patterns\n"
+            "3. Use analyze_security_threat for any indicators found\n"
+            "4. Use check_ioc_reputation for suspicious IPs/domains\n"
+            "5. Use generate_security_report to document findings"
+        ),
+        {"hunt_hypothesis": "suspicious activity", "agent_scope": "all"},
+    ),
+    "compliance_audit": _PromptTemplate(
+        "Compliance audit workflow",
+        Template(
+            "Perform $framework compliance audit. "
+            "Include remediation: $include_remediation. "
+            "Steps:\n"
+            "1. Use run_compliance_check with the specified framework\n"
+            "2. Use get_wazuh_agents to assess agent coverage\n"
+            "3. Use get_wazuh_vulnerabilities to identify security gaps\n"
+            "4. Use generate_security_report for compliance documentation"
+        ),
+        {"framework": "PCI-DSS", "include_remediation": "true"},
+    ),
+    "vulnerability_assessment": _PromptTemplate(
+        "Vulnerability assessment workflow",
+        Template(
+            "Assess vulnerabilities with severity >= $severity_threshold. "
+            "Agent: $agent_id. "
+            "Workflow:\n"
+            "1. Use get_wazuh_vulnerabilities to retrieve vulnerability data\n"
+            "2. Use get_wazuh_critical_vulnerabilities for highest priority items\n"
+            "3. Use get_wazuh_vulnerability_summary for statistics\n"
+            "4. Use perform_risk_assessment to evaluate overall risk"
+        ),
+        {"severity_threshold": "medium", "agent_id": "all"},
+    ),
+}
+
+
+@lru_cache(maxsize=256, typed=True)
+def _render_prompt(name: str, *values: Any) -> Dict[str, Any]:
+    """
+    Render a prompts/get response from the template's argument values, in defaults order.
 
-    # Simple pagination (no cursor means start from beginning)
-    # In production, implement proper cursor-based pagination
-    return {"prompts": prompts, "nextCursor": None}  # No more results
+    Rendering is pure, so results are cached for the process lifetime; the templates
+    never change at runtime and callers must treat the returned dict as read-only.
+    """
+    prompt = _PROMPT_TEMPLATES[name]
+    text = prompt.template.safe_substitute(dict(zip(prompt.defaults, values)))
+    return {
+        "description": prompt.description,
+        "messages": [{"role": "user", "content": {"type": "text", "text": text}}],
+    }
 
 
 async def handle_prompts_get(params: Dict[str, Any], session: MCPSession) -> Dict[str, Any]:
@@ -899,88 +1060,58 @@ async def handle_prompts_get(params: Dict[str, Any], session: MCPSession) -> Dic
     if not name:
         raise ValueError("Prompt name is required")
 
-    # Prompt templates
-    prompt_templates = {
-        "security_investigation": {
-            "description": "Security incident investigation workflow",
-            "messages": [
-                {
-                    "role": "user",
-                    "content": {
-                        "type": "text",
-                        "text": f"Investigate a {arguments.get('incident_type', 'security')} incident. "
-                        f"Time range: {arguments.get('time_range', '24h')}. "
-                        f"Steps:\n"
-                        f"1. Use get_wazuh_alerts to retrieve relevant alerts\n"
-                        f"2. Use analyze_alert_patterns to identify patterns\n"
-                        f"3. Use search_security_events to find related events\n"
-                        f"4. Use check_agent_health for affected agents\n"
-                        f"5. Use perform_risk_assessment to evaluate impact",
-                    },
-                }
-            ],
-        },
-        "threat_hunt": {
-            "description": "Proactive threat hunting workflow",
-            "messages": [
-                {
-                    "role": "user",
-                    "content": {
-                        "type": "text",
-                        "text": f"Hunt for threats based on hypothesis: {arguments.get('hunt_hypothesis', 'suspicious activity')}. "
-                        f"Agent scope: {arguments.get('agent_scope', 'all')}. "
-                        f"Workflow:\n"
-                        f"1. Use get_wazuh_agents to identify target agents\n"
-                        f"2. Use search_security_events with relevant patterns\n"
-                        f"3. Use analyze_security_threat for any indicators found\n"
-                        f"4. Use check_ioc_reputation for suspicious IPs/domains\n"
-                        f"5. Use generate_security_report to document findings",
-                    },
-                }
-            ],
-        },
-        "compliance_audit": {
-            "description": "Compliance audit workflow",
-            "messages": [
-                {
-                    "role": "user",
-                    "content": {
-                        "type": "text",
-                        "text": f"Perform {arguments.get('framework', 'PCI-DSS')} compliance audit. "
-                        f"Include remediation: {arguments.get('include_remediation', 'true')}. "
-                        f"Steps:\n"
-                        f"1. Use run_compliance_check with the specified framework\n"
-                        f"2. Use get_wazuh_agents to assess agent coverage\n"
-                        f"3. Use get_wazuh_vulnerabilities to identify security gaps\n"
-                        f"4. Use generate_security_report for compliance documentation",
-                    },
-                }
-            ],
-        },
-        "vulnerability_assessment": {
-            "description": "Vulnerability assessment workflow",
-            "messages": [
-                {
-                    "role": "user",
-                    "content": {
-                        "type": "text",
-                        "text": f"Assess vulnerabilities with severity >= {arguments.get('severity_threshold', 'medium')}. "
-                        f"Agent: {arguments.get('agent_id', 'all')}. "
-                        f"Workflow:\n"
-                        f"1. Use get_wazuh_vulnerabilities to retrieve vulnerability data\n"
-                        f"2. Use get_wazuh_critical_vulnerabilities for highest priority items\n"
-                        f"3. Use get_wazuh_vulnerability_summary for statistics\n"
-                        f"4. Use perform_risk_assessment to evaluate overall risk",
-                    },
-                }
-            ],
-        },
-    }
-
-    if name not in prompt_templates:
+    prompt = _PROMPT_TEMPLATES.get(name)
+    if prompt is None:
         raise ValueError(f"Unknown prompt: {name}")
 
-    return prompt_templates[name]
+    values = [arguments.get(key, default) for key, default in prompt.defaults.items()]
+    try:
+        return _render_prompt(name, *values)
+    except TypeError:
+        # Unhashable argument values (lists, objects) can't be cache keys
+        return _render_prompt.__wrapped__(name, *values)
+
+
+MCP_RESOURCES = [
+    {
+        "uri": "wazuh://manager/info",
+        "name": "Wazuh Manager Information",
+        "description": "Current Wazuh manager status and configuration",
+        "mimeType": "application/json",
+    },
+    {
+        "uri": "wazuh://agents/summary",
+        "name": "Agents Summary",
+        "description": "Summary of all Wazuh agents and their status",
+        "mimeType": "application/json",
+    },
+    {
+        "uri": "wazuh://alerts/recent",
+        "name": "Recent Alerts",
+        "description": "Most recent security alerts from Wazuh",
+        "mimeType": "application/json",
+    },
+    {
+        "uri": "wazuh://cluster/status",
+        "name": "Cluster Status",
+        "description": "Wazuh cluster health and node information",
+        "mimeType": "application/json",
+    },
+    {
+        "uri": "wazuh://rules/summary",
+        "name": "Rules Summary",
+        "description": "Summary of active Wazuh detection rules",
+        "mimeType": "application/json",
+    },
+    {
+        "uri": "wazuh://vulnerabilities/critical",
+        "name": "Critical Vulnerabilities",
+        "description": "Critical vulnerabilities from Wazuh Indexer (requires 4.8.0+)",
+        "mimeType": "application/json",
+    },
+]
+
+_RESOURCES_LIST_RESPONSE = {"resources": MCP_RESOURCES, "nextCursor": None}
 
 
 async def handle_resources_list(params: Dict[str, Any], session: MCPSession) -> Dict[str, Any]:
@@ -988,49 +1119,22 @@ async def handle_resources_list(params: Dict[str, Any], session: MCPSession) ->
     Handle resources/list method per MCP specification.
     Returns list of available resources with pagination support.
     """
-    _cursor = params.get("cursor")  # Reserved for future pagination
-
-    # Wazuh resources
-    resources = [
-        {
-            "uri": "wazuh://manager/info",
-            "name": "Wazuh Manager Information",
-            "description": "Current Wazuh manager status and configuration",
-            "mimeType": "application/json",
-        },
-        {
-            "uri": "wazuh://agents/summary",
-            "name": "Agents Summary",
-            "description": "Summary of all Wazuh agents and their status",
-            "mimeType": "application/json",
-        },
-        {
-            "uri": "wazuh://alerts/recent",
-            "name": "Recent Alerts",
-            "description": "Most recent security alerts from Wazuh",
-            "mimeType": "application/json",
-        },
-        {
-            "uri": "wazuh://cluster/status",
-            "name": "Cluster Status",
-            "description": "Wazuh cluster health and node information",
-            "mimeType": "application/json",
-        },
-        {
-            "uri": "wazuh://rules/summary",
-            "name": "Rules Summary",
-            "description": "Summary of active Wazuh detection rules",
-            "mimeType": "application/json",
-        },
-        {
-            "uri": "wazuh://vulnerabilities/critical",
-            "name": "Critical Vulnerabilities",
-            "description": "Critical vulnerabilities from Wazuh Indexer (requires 4.8.0+)",
-            "mimeType": "application/json",
-        },
-    ]
+    # Static catalogue, served from a single page built at import
+    return _RESOURCES_LIST_RESPONSE
+
+
+# Resource path (URI without the wazuh:// scheme) -> client fetch
+_RESOURCE_DISPATCH: Final[Dict[str, Callable[[WazuhClient], Awaitable[Any]]]] = {
+    "manager/info": lambda client: client.get_manager_info(),
+    "agents/summary": lambda client: client.get_running_agents(),
+    "alerts/recent": lambda client: client.get_alerts(limit=50),
+    "cluster/status": lambda client: client.get_cluster_health(),
+    "rules/summary": lambda client: client.get_rules_summary(),
+    "vulnerabilities/critical": lambda client: client.get_critical_vulnerabilities(limit=50),
+}
 
-    return {"resources": resources, "nextCursor": None}
+# Resource path -> (expires_at monotonic, fetched data, rendered JSON text)
+_resource_cache: Dict[str, Tuple[float, Any, str]] = {}
 
 
 async def handle_resources_read(params: Dict[str, Any], session: MCPSession) -> Dict[str, Any]:
@@ -1050,55 +1154,77 @@ async def handle_resources_read(params: Dict[str, Any], session: MCPSession) ->
     resource_path = uri[8:]  # Remove "wazuh://"
 
     try:
-        if resource_path == "manager/info":
-            data = await wazuh_client.get_manager_info()
-        elif resource_path == "agents/summary":
-            data = await wazuh_client.get_running_agents()
-        elif resource_path == "alerts/recent":
-            data = await wazuh_client.get_alerts(limit=50)
-        elif resource_path == "cluster/status":
-            data = await wazuh_client.get_cluster_health()
-        elif resource_path == "rules/summary":
-            data = await wazuh_client.get_rules_summary()
-        elif resource_path == "vulnerabilities/critical":
-            data = await wazuh_client.get_critical_vulnerabilities(limit=50)
-        else:
+        fetch = _RESOURCE_DISPATCH.get(resource_path)
+        if fetch is None:
             raise ValueError(f"Resource not found: {uri}")
 
-        return {"contents": [{"uri": uri, "mimeType": "application/json", "text": json.dumps(data, indent=2)}]}
+        now = time.monotonic()
+        cached = _resource_cache.get(resource_path)
+        if cached is not None and cached[0] > now:
+            text = cached[2]
+        else:
+            data = await fetch(wazuh_client)
+            # The client hands back the same object while its own cache is warm; reuse that rendering
+            text = cached[2] if cached is not None and cached[1] is data else _dump_json(data)
+            _resource_cache[resource_path] = (now + RESOURCE_CACHE_TTL_SECONDS, data, text)
+
+        return {"contents": [{"uri": uri, "mimeType": "application/json", "text": text}]}
 
     except Exception as e:
         logger.error(f"Error reading resource {uri}: {e}")
         raise ValueError(f"Failed to read resource: {str(e)}")
 
 
+MCP_RESOURCE_TEMPLATES = [
+    {
+        "uriTemplate": "wazuh://agents/{agent_id}/info",
+        "name": "Agent Information",
+        "description": "Detailed information for a specific agent",
+        "mimeType": "application/json",
+    },
+    {
+        "uriTemplate": "wazuh://agents/{agent_id}/alerts",
+        "name": "Agent Alerts",
+        "description": "Recent alerts for a specific agent",
+        "mimeType": "application/json",
+    },
+    {
+        "uriTemplate": "wazuh://agents/{agent_id}/vulnerabilities",
+        "name": "Agent Vulnerabilities",
+        "description": "Vulnerabilities for a specific agent",
+        "mimeType": "application/json",
+    },
+]
+
+_RESOURCE_TEMPLATES_RESPONSE = {"resourceTemplates": MCP_RESOURCE_TEMPLATES, "nextCursor": None}
+
+
 async def handle_resources_templates_list(params: Dict[str, Any], session: MCPSession) -> Dict[str, Any]:
     """
     Handle resources/templates/list method per MCP specification.
     Returns list of resource URI templates.
     """
-    templates = [
-        {
-            "uriTemplate": "wazuh://agents/{agent_id}/info",
-            "name": "Agent Information",
-            "description": "Detailed information for a specific agent",
-            "mimeType": "application/json",
-        },
-        {
-            "uriTemplate": "wazuh://agents/{agent_id}/alerts",
-            "name": "Agent Alerts",
-            "description": "Recent alerts for a specific agent",
-            "mimeType": "application/json",
-        },
-        {
-            "uriTemplate": "wazuh://agents/{agent_id}/vulnerabilities",
-            "name": "Agent Vulnerabilities",
-            "description": "Vulnerabilities for a specific agent",
-            "mimeType": "application/json",
-        },
-    ]
-
-    return {"resourceTemplates": templates, "nextCursor": None}
+    # Static catalogue, served from a single page built at import
+    return _RESOURCE_TEMPLATES_RESPONSE
+
+
+def _completion_candidates(*values: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Pair completion values with their lowercased forms for prefix matching."""
+    return values, tuple(value.lower() for value in values)
+
+
+_NO_COMPLETIONS: Final = _completion_candidates()
+_AGENT_ID_COMPLETIONS: Final = _completion_candidates("001", "002", "003", "004", "005")
+# Prompt argument name -> suggested values
+_PROMPT_ARGUMENT_COMPLETIONS: Final = {
+    "incident_type": _completion_candidates(
+        "malware", "intrusion", "data_breach", "ransomware", "phishing", "insider_threat"
+    ),
+    "time_range": _completion_candidates("1h", "6h", "24h", "7d", "30d"),
+    "framework": _completion_candidates("PCI-DSS", "HIPAA", "SOX", "GDPR", "NIST"),
+    "severity_threshold": _completion_candidates("low", "medium", "high", "critical"),
+    "agent_scope": _completion_candidates("all", "critical", "specific"),
+}
 
 
 async def handle_completion_complete(params: Dict[str, Any], session: MCPSession) -> Dict[str, Any]:
@@ -1114,29 +1240,26 @@ async def handle_completion_complete(params: Dict[str, Any], session: MCPSession
     arg_name = argument.get("name", "")
     arg_value = argument.get("value", "")
 
-    completions = []
+    candidates = _NO_COMPLETIONS
 
     # Provide completions based on context
     if ref_type == "ref/prompt":
-        if arg_name == "incident_type":
-            completions = ["malware", "intrusion", "data_breach", "ransomware", "phishing", "insider_threat"]
-        elif arg_name == "time_range":
-            completions = ["1h", "6h", "24h", "7d", "30d"]
-        elif arg_name == "framework":
-            completions = ["PCI-DSS", "HIPAA", "SOX", "GDPR", "NIST"]
-        elif arg_name == "severity_threshold":
-            completions = ["low", "medium", "high", "critical"]
-        elif arg_name == "agent_scope":
-            completions = ["all", "critical", "specific"]
+        # Clients may send any JSON here; unhashable names can't be dict keys
+        if isinstance(arg_name, str):
+            candidates = _PROMPT_ARGUMENT_COMPLETIONS.get(arg_name, _NO_COMPLETIONS)
 
     elif ref_type == "ref/resource":
         if "agent" in ref_name.lower():
             # Could fetch actual agent IDs here
-            completions = ["001", "002", "003", "004", "005"]
+            candidates = _AGENT_ID_COMPLETIONS
 
-    # Filter by current value
+    values, lowered = candidates
     if arg_value:
-        completions = [c for c in completions if c.lower().startswith(arg_value.lower())]
+        # Filter by current value
+        prefix = arg_value.lower()
+        completions = [value for value, folded in zip(values, lowered) if folded.startswith(prefix)]
+    else:
+        completions = list(values)
 
     return {
         "completion": {
@@ -1147,342 +1270,513 @@ async def handle_completion_complete(params: Dict[str, Any], session: MCPSession
     }
 
 
-async def handle_tools_list(params: Dict[str, Any], session: MCPSession) -> Dict[str, Any]:
-    """Handle tools/list method - All 29 Wazuh Security Tools with pagination."""
-    _cursor = params.get("cursor")  # Reserved for future pagination
-    tools = [
-        # Alert Management Tools (4 tools)
-        {
-            "name": "get_wazuh_alerts",
-            "description": "Retrieve Wazuh security alerts with optional filtering",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "limit": {"type": "integer", "minimum": 1, "maximum": 1000, "default": 100},
-                    "rule_id": {"type": "string", "description": "Filter by specific rule ID"},
-                    "level": {"type": "string", "description": "Filter by alert level (e.g., '12', '10+')"},
-                    "agent_id": {"type": "string", "description": "Filter by agent ID"},
-                    "timestamp_start": {"type": "string", "description": "Start timestamp (ISO format)"},
-                    "timestamp_end": {"type": "string", "description": "End timestamp (ISO format)"},
-                    "compact": {
-                        "type": "boolean",
-                        "default": True,
-                        "description": "Return compact alerts with essential fields only (recommended to avoid token limits)",
-                    },
+MCP_TOOLS = [
+    # Alert Management Tools (4 tools)
+    {
+        "name": "get_wazuh_alerts",
+        "description": "Retrieve Wazuh security alerts with optional filtering",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "limit": {"type": "integer", "minimum": 1, "maximum": 1000, "default": 100},
+                "rule_id": {"type": "string", "description": "Filter by specific rule ID"},
+                "level": {"type": "string", "description": "Filter by alert level (e.g., '12', '10+')"},
+                "agent_id": {"type": "string", "description": "Filter by agent ID"},
+                "timestamp_start": {"type": "string", "description": "Start timestamp (ISO format)"},
+                "timestamp_end": {"type": "string", "description": "End timestamp (ISO format)"},
+                "compact": {
+                    "type": "boolean",
+                    "default": True,
+                    "description": "Return compact alerts with essential fields only (recommended to avoid token limits)",
                 },
-                "required": [],
             },
+            "required": [],
         },
-        {
-            "name": "get_wazuh_alert_summary",
-            "description": "Get a summary of Wazuh alerts grouped by specified field",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "time_range": {"type": "string", "enum": ["1h", "6h", "24h", "7d"], "default": "24h"},
-                    "group_by": {"type": "string", "default": "rule.level"},
-                },
-                "required": [],
+    },
+    {
+        "name": "get_wazuh_alert_summary",
+        "description": "Get a summary of Wazuh alerts grouped by specified field",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "time_range": {"type": "string", "enum": ["1h", "6h", "24h", "7d"], "default": "24h"},
+                "group_by": {"type": "string", "default": "rule.level"},
             },
+            "required": [],
         },
-        {
-            "name": "analyze_alert_patterns",
-            "description": "Analyze alert patterns to identify trends and anomalies",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "time_range": {"type": "string", "enum": ["1h", "6h", "24h", "7d"], "default": "24h"},
-                    "min_frequency": {"type": "integer", "minimum": 1, "default": 5},
-                },
-                "required": [],
+    },
+    {
+        "name": "analyze_alert_patterns",
+        "description": "Analyze alert patterns to identify trends and anomalies",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "time_range": {"type": "string", "enum": ["1h", "6h", "24h", "7d"], "default": "24h"},
+                "min_frequency": {"type": "integer", "minimum": 1, "default": 5},
             },
+            "required": [],
         },
-        {
-            "name": "search_security_events",
-            "description": "Search for specific security events across all Wazuh data",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "query": {"type": "string", "description": "Search query or pattern"},
-                    "time_range": {"type": "string", "enum": ["1h", "6h", "24h", "7d"], "default": "24h"},
-                    "limit": {"type": "integer", "minimum": 1, "maximum": 1000, "default": 100},
-                    "compact": {
-                        "type": "boolean",
-                        "default": True,
-                        "description": "Return compact events with essential fields only (recommended to avoid token limits)",
-                    },
+    },
+    {
+        "name": "search_security_events",
+        "description": "Search for specific security events across all Wazuh data",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Search query or pattern"},
+                "time_range": {"type": "string", "enum": ["1h", "6h", "24h", "7d"], "default": "24h"},
+                "limit": {"type": "integer", "minimum": 1, "maximum": 1000, "default": 100},
+                "compact": {
+                    "type": "boolean",
+                    "default": True,
+                    "description": "Return compact events with essential fields only (recommended to avoid token limits)",
                 },
-                "required": ["query"],
             },
+            "required": ["query"],
         },
-        # Agent Management Tools (6 tools)
-        {
-            "name": "get_wazuh_agents",
-            "description": "Retrieve information about Wazuh agents",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "agent_id": {"type": "string", "description": "Specific agent ID to query"},
-                    "status": {
-                        "type": "string",
-                        "enum": ["active", "disconnected", "never_connected"],
-                        "description": "Filter by agent status",
-                    },
-                    "limit": {"type": "integer", "minimum": 1, "maximum": 1000, "default": 100},
+    },
+    # Agent Management Tools (6 tools)
+    {
+        "name": "get_wazuh_agents",
+        "description": "Retrieve information about Wazuh agents",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "agent_id": {"type": "string", "description": "Specific agent ID to query"},
+                "status": {
+                    "type": "string",
+                    "enum": ["active", "disconnected", "never_connected"],
+                    "description": "Filter by agent status",
                 },
-                "required": [],
+                "limit": {"type": "integer", "minimum": 1, "maximum": 1000, "default": 100},
             },
+            "required": [],
         },
-        {
-            "name": "get_wazuh_running_agents",
-            "description": "Get list of currently running/active Wazuh agents",
-            "inputSchema": {"type": "object", "properties": {}, "required": []},
-        },
-        {
-            "name": "check_agent_health",
-            "description": "Check the health status of a specific Wazuh agent",
-            "inputSchema": {
-                "type": "object",
-                "properties": {"agent_id": {"type": "string", "description": "ID of the agent to check"}},
-                "required": ["agent_id"],
-            },
+    },
+    {
+        "name": "get_wazuh_running_agents",
+        "description": "Get list of currently running/active Wazuh agents",
+        "inputSchema": {"type": "object", "properties": {}, "required": []},
+    },
+    {
+        "name": "check_agent_health",
+        "description": "Check the health status of a specific Wazuh agent",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"agent_id": {"type": "string", "description": "ID of the agent to check"}},
+            "required": ["agent_id"],
         },
-        {
-            "name": "get_agent_processes",
-            "description": "Get running processes from a specific Wazuh agent",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "agent_id": {"type": "string", "description": "ID of the agent"},
-                    "limit": {"type": "integer", "minimum": 1, "maximum": 1000, "default": 100},
-                },
-                "required": ["agent_id"],
+    },
+    {
+        "name": "get_agent_processes",
+        "description": "Get running processes from a specific Wazuh agent",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "agent_id": {"type": "string", "description": "ID of the agent"},
+                "limit": {"type": "integer", "minimum": 1, "maximum": 1000, "default": 100},
             },
+            "required": ["agent_id"],
         },
-        {
-            "name": "get_agent_ports",
-            "description": "Get open ports from a specific Wazuh agent",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "agent_id": {"type": "string", "description": "ID of the agent"},
-                    "limit": {"type": "integer", "minimum": 1, "maximum": 1000, "default": 100},
-                },
-                "required": ["agent_id"],
+    },
+    {
+        "name": "get_agent_ports",
+        "description": "Get open ports from a specific Wazuh agent",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "agent_id": {"type": "string", "description": "ID of the agent"},
+                "limit": {"type": "integer", "minimum": 1, "maximum": 1000, "default": 100},
             },
+            "required": ["agent_id"],
         },
-        {
-            "name": "get_agent_configuration",
-            "description": "Get configuration details for a specific Wazuh agent",
-            "inputSchema": {
-                "type": "object",
-                "properties": {"agent_id": {"type": "string", "description": "ID of the agent"}},
-                "required": ["agent_id"],
-            },
+    },
+    {
+        "name": "get_agent_configuration",
+        "description": "Get configuration details for a specific Wazuh agent",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"agent_id": {"type": "string", "description": "ID of the agent"}},
+            "required": ["agent_id"],
         },
-        # Vulnerability Management Tools (3 tools) - Requires Wazuh Indexer (4.8.0+)
-        {
-            "name": "get_wazuh_vulnerabilities",
-            "description": "Retrieve vulnerability information from Wazuh Indexer (requires WAZUH_INDEXER_HOST configuration)",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "agent_id": {"type": "string", "description": "Filter by specific agent ID"},
-                    "severity": {
-                        "type": "string",
-                        "enum": ["low", "medium", "high", "critical"],
-                        "description": "Filter by severity level",
-                    },
-                    "limit": {"type": "integer", "minimum": 1, "maximum": 500, "default": 100},
-                    "compact": {
-                        "type": "boolean",
-                        "default": True,
-                        "description": "Return compact vulnerabilities with essential fields only (recommended to avoid token limits)",
-                    },
+    },
+    # Vulnerability Management Tools (3 tools) - Requires Wazuh Indexer (4.8.0+)
+    {
+        "name": "get_wazuh_vulnerabilities",
+        "description": "Retrieve vulnerability information from Wazuh Indexer (requires WAZUH_INDEXER_HOST configuration)",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "agent_id": {"type": "string", "description": "Filter by specific agent ID"},
+                "severity": {
+                    "type": "string",
+                    "enum": ["low", "medium", "high", "critical"],
+                    "description": "Filter by severity level",
+                },
+                "limit": {"type": "integer", "minimum": 1, "maximum": 500, "default": 100},
+                "compact": {
+                    "type": "boolean",
+                    "default": True,
+                    "description": "Return compact vulnerabilities with essential fields only (recommended to avoid token limits)",
                 },
-                "required": [],
             },
+            "required": [],
         },
-        {
-            "name": "get_wazuh_critical_vulnerabilities",
-            "description": "Get critical vulnerabilities from Wazuh Indexer (requires WAZUH_INDEXER_HOST configuration)",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "limit": {"type": "integer", "minimum": 1, "maximum": 500, "default": 50},
-                    "compact": {
-                        "type": "boolean",
-                        "default": True,
-                        "description": "Return compact vulnerabilities with essential fields only (recommended to avoid token limits)",
-                    },
+    },
+    {
+        "name": "get_wazuh_critical_vulnerabilities",
+        "description": "Get critical vulnerabilities from Wazuh Indexer (requires WAZUH_INDEXER_HOST configuration)",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "limit": {"type": "integer", "minimum": 1, "maximum": 500, "default": 50},
+                "compact": {
+                    "type": "boolean",
+                    "default": True,
+                    "description": "Return compact vulnerabilities with essential fields only (recommended to avoid token limits)",
                 },
-                "required": [],
             },
+            "required": [],
         },
-        {
-            "name": "get_wazuh_vulnerability_summary",
-            "description": "Get vulnerability summary statistics from Wazuh Indexer (requires WAZUH_INDEXER_HOST configuration)",
-            "inputSchema": {
-                "type": "object",
-                "properties": {"time_range": {"type": "string", "enum": ["1d", "7d", "30d"], "default": "7d"}},
-                "required": [],
-            },
+    },
+    {
+        "name": "get_wazuh_vulnerability_summary",
+        "description": "Get vulnerability summary statistics from Wazuh Indexer (requires WAZUH_INDEXER_HOST configuration)",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"time_range": {"type": "string", "enum": ["1d", "7d", "30d"], "default": "7d"}},
+            "required": [],
         },
-        # Security Analysis Tools (6 tools)
-        {
-            "name": "analyze_security_threat",
-            "description": "Analyze a security threat indicator using AI-powered analysis",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "indicator": {
-                        "type": "string",
-                        "description": "The threat indicator to analyze (IP, hash, domain)",
-                    },
-                    "indicator_type": {"type": "string", "enum": ["ip", "hash", "domain", "url"], "default": "ip"},
+    },
+    # Security Analysis Tools (6 tools)
+    {
+        "name": "analyze_security_threat",
+        "description": "Analyze a security threat indicator using AI-powered analysis",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "indicator": {
+                    "type": "string",
+                    "description": "The threat indicator to analyze (IP, hash, domain)",
                 },
-                "required": ["indicator"],
+                "indicator_type": {"type": "string", "enum": ["ip", "hash", "domain", "url"], "default": "ip"},
             },
+            "required": ["indicator"],
         },
-        {
-            "name": "check_ioc_reputation",
-            "description": "Check reputation of an Indicator of Compromise (IoC)",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "indicator": {"type": "string", "description": "The IoC to check (IP, domain, hash, etc.)"},
-                    "indicator_type": {"type": "string", "enum": ["ip", "domain", "hash", "url"], "default": "ip"},
-                },
-                "required": ["indicator"],
+    },
+    {
+        "name": "check_ioc_reputation",
+        "description": "Check reputation of an Indicator of Compromise (IoC)",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "indicator": {"type": "string", "description": "The IoC to check (IP, domain, hash, etc.)"},
+                "indicator_type": {"type": "string", "enum": ["ip", "domain", "hash", "url"], "default": "ip"},
             },
+            "required": ["indicator"],
         },
-        {
-            "name": "perform_risk_assessment",
-            "description": "Perform comprehensive risk assessment for agents or the entire environment",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "agent_id": {
-                        "type": "string",
-                        "description": "Specific agent ID to assess (if None, assess entire environment)",
-                    }
-                },
-                "required": [],
+    },
+    {
+        "name": "perform_risk_assessment",
+        "description": "Perform comprehensive risk assessment for agents or the entire environment",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "agent_id": {
+                    "type": "string",
+                    "description": "Specific agent ID to assess (if None, assess entire environment)",
+                }
             },
+            "required": [],
         },
-        {
-            "name": "get_top_security_threats",
-            "description": "Get top security threats based on alert frequency and severity",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "limit": {"type": "integer", "minimum": 1, "maximum": 50, "default": 10},
-                    "time_range": {"type": "string", "enum": ["1h", "6h", "24h", "7d"], "default": "24h"},
-                },
-                "required": [],
+    },
+    {
+        "name": "get_top_security_threats",
+        "description": "Get top security threats based on alert frequency and severity",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "limit": {"type": "integer", "minimum": 1, "maximum": 50, "default": 10},
+                "time_range": {"type": "string", "enum": ["1h", "6h", "24h", "7d"], "default": "24h"},
             },
+            "required": [],
         },
-        {
-            "name": "generate_security_report",
-            "description": "Generate comprehensive security report",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "report_type": {
-                        "type": "string",
-                        "enum": ["daily", "weekly", "monthly", "incident"],
-                        "default": "daily",
-                    },
-                    "include_recommendations": {"type": "boolean", "default": True},
+    },
+    {
+        "name": "generate_security_report",
+        "description": "Generate comprehensive security report",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "report_type": {
+                    "type": "string",
+                    "enum": ["daily", "weekly", "monthly", "incident"],
+                    "default": "daily",
                 },
-                "required": [],
+                "include_recommendations": {"type": "boolean", "default": True},
             },
+            "required": [],
         },
-        {
-            "name": "run_compliance_check",
-            "description": "Run compliance check against security frameworks",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "framework": {
-                        "type": "string",
-                        "enum": ["PCI-DSS", "HIPAA", "SOX", "GDPR", "NIST"],
-                        "default": "PCI-DSS",
-                    },
-                    "agent_id": {
-                        "type": "string",
-                        "description": "Specific agent ID to check (if None, check entire environment)",
-                    },
+    },
+    {
+        "name": "run_compliance_check",
+        "description": "Run compliance check against security frameworks",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "framework": {
+                    "type": "string",
+                    "enum": ["PCI-DSS", "HIPAA", "SOX", "GDPR", "NIST"],
+                    "default": "PCI-DSS",
                 },
-                "required": [],
-            },
-        },
-        # System Monitoring Tools (10 tools)
-        {
-            "name": "get_wazuh_statistics",
-            "description": "Get comprehensive Wazuh statistics and metrics",
-            "inputSchema": {"type": "object", "properties": {}, "required": []},
-        },
-        {
-            "name": "get_wazuh_weekly_stats",
-            "description": "Get weekly statistics from Wazuh including alerts, agents, and trends",
-            "inputSchema": {"type": "object", "properties": {}, "required": []},
-        },
-        {
-            "name": "get_wazuh_cluster_health",
-            "description": "Get Wazuh cluster health information",
-            "inputSchema": {"type": "object", "properties": {}, "required": []},
-        },
-        {
-            "name": "get_wazuh_cluster_nodes",
-            "description": "Get information about Wazuh cluster nodes",
-            "inputSchema": {"type": "object", "properties": {}, "required": []},
-        },
-        {
-            "name": "get_wazuh_rules_summary",
-            "description": "Get summary of Wazuh rules and their effectiveness",
-            "inputSchema": {"type": "object", "properties": {}, "required": []},
-        },
-        {
-            "name": "get_wazuh_remoted_stats",
-            "description": "Get Wazuh remoted (agent communication) statistics",
-            "inputSchema": {"type": "object", "properties": {}, "required": []},
-        },
-        {
-            "name": "get_wazuh_log_collector_stats",
-            "description": "Get Wazuh log collector statistics",
-            "inputSchema": {"type": "object", "properties": {}, "required": []},
-        },
-        {
-            "name": "search_wazuh_manager_logs",
-            "description": "Search Wazuh manager logs for specific patterns",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "query": {"type": "string", "description": "Search query/pattern"},
-                    "limit": {"type": "integer", "minimum": 1, "maximum": 1000, "default": 100},
+                "agent_id": {
+                    "type": "string",
+                    "description": "Specific agent ID to check (if None, check entire environment)",
                 },
-                "required": ["query"],
             },
+            "required": [],
         },
-        {
-            "name": "get_wazuh_manager_error_logs",
-            "description": "Get recent error logs from Wazuh manager",
-            "inputSchema": {
-                "type": "object",
-                "properties": {"limit": {"type": "integer", "minimum": 1, "maximum": 1000, "default": 100}},
-                "required": [],
+    },
+    # System Monitoring Tools (10 tools)
+    {
+        "name": "get_wazuh_statistics",
+        "description": "Get comprehensive Wazuh statistics and metrics",
+        "inputSchema": {"type": "object", "properties": {}, "required": []},
+    },
+    {
+        "name": "get_wazuh_weekly_stats",
+        "description": "Get weekly statistics from Wazuh including alerts, agents, and trends",
+        "inputSchema": {"type": "object", "properties": {}, "required": []},
+    },
+    {
+        "name": "get_wazuh_cluster_health",
+        "description": "Get Wazuh cluster health information",
+        "inputSchema": {"type": "object", "properties": {}, "required": []},
+    },
+    {
+        "name": "get_wazuh_cluster_nodes",
+        "description": "Get information about Wazuh cluster nodes",
+        "inputSchema": {"type": "object", "properties": {}, "required": []},
+    },
+    {
+        "name": "get_wazuh_rules_summary",
+        "description": "Get summary of Wazuh rules and their effectiveness",
+        "inputSchema": {"type": "object", "properties": {}, "required": []},
+    },
+    {
+        "name": "get_wazuh_remoted_stats",
+        "description": "Get Wazuh remoted (agent communication) statistics",
+        "inputSchema": {"type": "object", "properties": {}, "required": []},
+    },
+    {
+        "name": "get_wazuh_log_collector_stats",
+        "description": "Get Wazuh log collector statistics",
+        "inputSchema": {"type": "object", "properties": {}, "required": []},
+    },
+    {
+        "name": "search_wazuh_manager_logs",
+        "description": "Search Wazuh manager logs for specific patterns",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Search query/pattern"},
+                "limit": {"type": "integer", "minimum": 1, "maximum": 1000, "default": 100},
             },
+            "required": ["query"],
         },
-        {
-            "name": "validate_wazuh_connection",
-            "description": "Validate connection to Wazuh server and return status",
-            "inputSchema": {"type": "object", "properties": {}, "required": []},
+    },
+    {
+        "name": "get_wazuh_manager_error_logs",
+        "description": "Get recent error logs from Wazuh manager",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"limit": {"type": "integer", "minimum": 1, "maximum": 1000, "default": 100}},
+            "required": [],
         },
-    ]
+    },
+    {
+        "name": "validate_wazuh_connection",
+        "description": "Validate connection to Wazuh server and return status",
+        "inputSchema": {"type": "object", "properties": {}, "required": []},
+    },
+]
+
+_TOOLS_LIST_RESPONSE = {"tools": MCP_TOOLS, "nextCursor": None}
+
+
+async def handle_tools_list(params: Dict[str, Any], session: MCPSession) -> Dict[str, Any]:
+    """Handle tools/list method - All 29 Wazuh Security Tools with pagination."""
+    # Static catalogue, served from a single page built at import
+    return _TOOLS_LIST_RESPONSE
+
+
+class _ToolSpec(NamedTuple):
+    """tools/call entry: result title, validating client call and optional compactor."""
+
+    title: str
+    call: Callable[[WazuhClient, Dict[str, Any]], Awaitable[Any]]
+    compactor: Optional[Callable[[dict], dict]] = None
+
+
+async def _call_get_wazuh_alerts(client: WazuhClient, arguments: Dict[str, Any]) -> Any:
+    return await client.get_alerts(
+        limit=validate_limit(arguments.get("limit"), max_val=1000),
+        rule_id=validate_rule_id(arguments.get("rule_id")),
+        level=arguments.get("level"),  # Free-form (e.g., "12", "10+")
+        agent_id=validate_agent_id(arguments.get("agent_id")),
+        timestamp_start=validate_timestamp(arguments.get("timestamp_start"), param_name="timestamp_start"),
+        timestamp_end=validate_timestamp(arguments.get("timestamp_end"), param_name="timestamp_end"),
+    )
+
+
+async def _call_get_wazuh_alert_summary(client: WazuhClient, arguments: Dict[str, Any]) -> Any:
+    time_range = validate_time_range(arguments.get("time_range"))
+    return await client.get_alert_summary(time_range, arguments.get("group_by", "rule.level"))
+
+
+async def _call_analyze_alert_patterns(client: WazuhClient, arguments: Dict[str, Any]) -> Any:
+    time_range = validate_time_range(arguments.get("time_range"))
+    min_frequency = validate_limit(arguments.get("min_frequency"), min_val=1, max_val=1000, param_name="min_frequency")
+    return await client.analyze_alert_patterns(time_range, min_frequency)
+
+
+async def _call_search_security_events(client: WazuhClient, arguments: Dict[str, Any]) -> Any:
+    query = validate_query(arguments.get("query"), required=True)
+    time_range = validate_time_range(arguments.get("time_range"))
+    limit = validate_limit(arguments.get("limit"), max_val=1000)
+    return await client.search_security_events(query, time_range, limit)
+
+
+async def _call_get_wazuh_agents(client: WazuhClient, arguments: Dict[str, Any]) -> Any:
+    return await client.get_agents(
+        agent_id=validate_agent_id(arguments.get("agent_id")),
+        status=validate_agent_status(arguments.get("status")),
+        limit=validate_limit(arguments.get("limit"), max_val=1000),
+    )
+
+
+async def _call_check_agent_health(client: WazuhClient, arguments: Dict[str, Any]) -> Any:
+    return await client.check_agent_health(validate_agent_id(arguments.get("agent_id"), required=True))
+
+
+async def _call_get_agent_processes(client: WazuhClient, arguments: Dict[str, Any]) -> Any:
+    agent_id = validate_agent_id(arguments.get("agent_id"), required=True)
+    return await client.get_agent_processes(agent_id, validate_limit(arguments.get("limit"), max_val=1000))
+
+
+async def _call_get_agent_ports(client: WazuhClient, arguments: Dict[str, Any]) -> Any:
+    agent_id = validate_agent_id(arguments.get("agent_id"), required=True)
+    return await client.get_agent_ports(agent_id, validate_limit(arguments.get("limit"), max_val=1000))
+
+
+async def _call_get_agent_configuration(client: WazuhClient, arguments: Dict[str, Any]) -> Any:
+    return await client.get_agent_configuration(validate_agent_id(arguments.get("agent_id"), required=True))
+
+
+async def _call_get_wazuh_vulnerabilities(client: WazuhClient, arguments: Dict[str, Any]) -> Any:
+    return await client.get_vulnerabilities(
+        agent_id=validate_agent_id(arguments.get("agent_id")),
+        severity=validate_severity(arguments.get("severity")),
+        limit=validate_limit(arguments.get("limit"), max_val=500),
+    )
 
-    # Pagination support per MCP spec
-    return {"tools": tools, "nextCursor": None}  # No more tools
+
+async def _call_get_wazuh_critical_vulnerabilities(client: WazuhClient, arguments: Dict[str, Any]) -> Any:
+    return await client.get_critical_vulnerabilities(
+        validate_limit(arguments.get("limit"), max_val=500, param_name="limit")
+    )
+
+
+async def _call_get_wazuh_vulnerability_summary(client: WazuhClient, arguments: Dict[str, Any]) -> Any:
+    return await client.get_vulnerability_summary(validate_time_range(arguments.get("time_range")))
+
+
+async def _call_analyze_security_threat(client: WazuhClient, arguments: Dict[str, Any]) -> Any:
+    indicator_type = validate_indicator_type(arguments.get("indicator_type"))
+    indicator = validate_indicator(arguments.get("indicator"), indicator_type)
+    return await client.analyze_security_threat(indicator, indicator_type)
+
+
+async def _call_check_ioc_reputation(client: WazuhClient, arguments: Dict[str, Any]) -> Any:
+    indicator_type = validate_indicator_type(arguments.get("indicator_type"))
+    indicator = validate_indicator(arguments.get("indicator"), indicator_type)
+    return await client.check_ioc_reputation(indicator, indicator_type)
+
+
+async def _call_perform_risk_assessment(client: WazuhClient, arguments: Dict[str, Any]) -> Any:
+    return await client.perform_risk_assessment(validate_agent_id(arguments.get("agent_id")))
+
+
+async def _call_get_top_security_threats(client: WazuhClient, arguments: Dict[str, Any]) -> Any:
+    limit = validate_limit(arguments.get("limit"), min_val=1, max_val=50)
+    time_range = validate_time_range(arguments.get("time_range"))
+    return await client.get_top_security_threats(limit, time_range)
+
+
+async def _call_generate_security_report(client: WazuhClient, arguments: Dict[str, Any]) -> Any:
+    report_type = validate_report_type(arguments.get("report_type"))
+    include_recommendations = validate_boolean(
+        arguments.get("include_recommendations"), default=True, param_name="include_recommendations"
+    )
+    return await client.generate_security_report(report_type, include_recommendations)
+
+
+async def _call_run_compliance_check(client: WazuhClient, arguments: Dict[str, Any]) -> Any:
+    framework = validate_compliance_framework(arguments.get("framework"))
+    agent_id = validate_agent_id(arguments.get("agent_id"))
+    return await client.run_compliance_check(framework, agent_id)
+
+
+async def _call_search_wazuh_manager_logs(client: WazuhClient, arguments: Dict[str, Any]) -> Any:
+    query = validate_query(arguments.get("query"), required=True)
+    return await client.search_manager_logs(query, validate_limit(arguments.get("limit"), max_val=1000))
+
+
+async def _call_get_wazuh_manager_error_logs(client: WazuhClient, arguments: Dict[str, Any]) -> Any:
+    return await client.get_manager_error_logs(validate_limit(arguments.get("limit"), max_val=1000))
+
+
+# Tool name -> spec; the client is passed in at call time since it is created in lifespan
+_TOOL_DISPATCH: Final[Dict[str, _ToolSpec]] = {
+    # Alert Management Tools
+    "get_wazuh_alerts": _ToolSpec("Wazuh Alerts", _call_get_wazuh_alerts, _compact_alerts_result),
+    "get_wazuh_alert_summary": _ToolSpec("Alert Summary", _call_get_wazuh_alert_summary),
+    "analyze_alert_patterns": _ToolSpec("Alert Patterns", _call_analyze_alert_patterns),
+    "search_security_events": _ToolSpec("Security Events", _call_search_security_events, _compact_alerts_result),
+    # Agent Management Tools
+    "get_wazuh_agents": _ToolSpec("Wazuh Agents", _call_get_wazuh_agents),
+    "get_wazuh_running_agents": _ToolSpec("Running Agents", lambda client, _: client.get_running_agents()),
+    "check_agent_health": _ToolSpec("Agent Health", _call_check_agent_health),
+    "get_agent_processes": _ToolSpec("Agent Processes", _call_get_agent_processes),
+    "get_agent_ports": _ToolSpec("Agent Ports", _call_get_agent_ports),
+    "get_agent_configuration": _ToolSpec("Agent Configuration", _call_get_agent_configuration),
+    # Vulnerability Management Tools
+    "get_wazuh_vulnerabilities": _ToolSpec("Vulnerabilities", _call_get_wazuh_vulnerabilities, _compact_vulns_result),
+    "get_wazuh_critical_vulnerabilities": _ToolSpec(
+        "Critical Vulnerabilities", _call_get_wazuh_critical_vulnerabilities, _compact_vulns_result
+    ),
+    "get_wazuh_vulnerability_summary": _ToolSpec("Vulnerability Summary", _call_get_wazuh_vulnerability_summary),
+    # Security Analysis Tools
+    "analyze_security_threat": _ToolSpec("Threat Analysis", _call_analyze_security_threat),
+    "check_ioc_reputation": _ToolSpec("IoC Reputation", _call_check_ioc_reputation),
+    "perform_risk_assessment": _ToolSpec("Risk Assessment", _call_perform_risk_assessment),
+    "get_top_security_threats": _ToolSpec("Top Security Threats", _call_get_top_security_threats),
+    "generate_security_report": _ToolSpec("Security Report", _call_generate_security_report),
+    "run_compliance_check": _ToolSpec("Compliance Check", _call_run_compliance_check),
+    # System Monitoring Tools
+    "get_wazuh_statistics": _ToolSpec("Wazuh Statistics", lambda client, _: client.get_wazuh_statistics()),
+    "get_wazuh_weekly_stats": _ToolSpec("Weekly Statistics", lambda client, _: client.get_weekly_stats()),
+    "get_wazuh_cluster_health": _ToolSpec("Cluster Health", lambda client, _: client.get_cluster_health()),
+    "get_wazuh_cluster_nodes": _ToolSpec("Cluster Nodes", lambda client, _: client.get_cluster_nodes()),
+    "get_wazuh_rules_summary": _ToolSpec("Rules Summary", lambda client, _: client.get_rules_summary()),
+    "get_wazuh_remoted_stats": _ToolSpec("Remoted Statistics", lambda client, _: client.get_remoted_stats()),
+    "get_wazuh_log_collector_stats": _ToolSpec(
+        "Log Collector Statistics", lambda client, _: client.get_log_collector_stats()
+    ),
+    "search_wazuh_manager_logs": _ToolSpec("Manager Logs", _call_search_wazuh_manager_logs),
+    "get_wazuh_manager_error_logs": _ToolSpec("Manager Error Logs", _call_get_wazuh_manager_error_logs),
+    "validate_wazuh_connection": _ToolSpec("Connection Validation", lambda client, _: client.validate_connection()),
+}
 
 
 async def handle_tools_call(params: Dict[str, Any], session: MCPSession) -> Dict[str, Any]:
@@ -1497,267 +1791,23 @@ async def handle_tools_call(params: Dict[str, Any], session: MCPSession) -> Dict
     validate_input(tool_name, max_length=100)
 
     # Track tool execution for metrics
-    import time as _time
-
-    from wazuh_mcp_server.monitoring import record_tool_execution
-
-    _start_time = _time.time()
+    _start_time = time.time()
     _success = False
 
     try:
-        # Alert Management Tools
-        if tool_name == "get_wazuh_alerts":
-            # Validate all parameters
-            limit = validate_limit(arguments.get("limit"), max_val=1000)
-            rule_id = validate_rule_id(arguments.get("rule_id"))
-            level = arguments.get("level")  # Free-form (e.g., "12", "10+")
-            agent_id = validate_agent_id(arguments.get("agent_id"))
-            timestamp_start = validate_timestamp(arguments.get("timestamp_start"), param_name="timestamp_start")
-            timestamp_end = validate_timestamp(arguments.get("timestamp_end"), param_name="timestamp_end")
-            compact = validate_boolean(arguments.get("compact"), default=True, param_name="compact")
-
-            result = await wazuh_client.get_alerts(
-                limit=limit,
-                rule_id=rule_id,
-                level=level,
-                agent_id=agent_id,
-                timestamp_start=timestamp_start,
-                timestamp_end=timestamp_end,
-            )
-            if compact:
-                result = _compact_alerts_result(result)
-            _success = True
-            return {
-                "content": [
-                    {"type": "text", "text": f"Wazuh Alerts:\n{json.dumps(result, indent=2 if not compact else None)}"}
-                ]
-            }
-
-        elif tool_name == "get_wazuh_alert_summary":
-            time_range = validate_time_range(arguments.get("time_range"))
-            group_by = arguments.get("group_by", "rule.level")
-            result = await wazuh_client.get_alert_summary(time_range, group_by)
-            _success = True
-            return {"content": [{"type": "text", "text": f"Alert Summary:\n{json.dumps(result, indent=2)}"}]}
-
-        elif tool_name == "analyze_alert_patterns":
-            time_range = validate_time_range(arguments.get("time_range"))
-            min_frequency = validate_limit(
-                arguments.get("min_frequency"), min_val=1, max_val=1000, param_name="min_frequency"
-            )
-            result = await wazuh_client.analyze_alert_patterns(time_range, min_frequency)
-            _success = True
-            return {"content": [{"type": "text", "text": f"Alert Patterns:\n{json.dumps(result, indent=2)}"}]}
-
-        elif tool_name == "search_security_events":
-            query = validate_query(arguments.get("query"), required=True)
-            time_range = validate_time_range(arguments.get("time_range"))
-            limit = validate_limit(arguments.get("limit"), max_val=1000)
-            compact = validate_boolean(arguments.get("compact"), default=True, param_name="compact")
-
-            result = await wazuh_client.search_security_events(query, time_range, limit)
-            if compact:
-                result = _compact_alerts_result(result)
-            _success = True
-            return {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": f"Security Events:\n{json.dumps(result, indent=2 if not compact else None)}",
-                    }
-                ]
-            }
-
-        # Agent Management Tools
-        elif tool_name == "get_wazuh_agents":
-            agent_id = validate_agent_id(arguments.get("agent_id"))
-            status = validate_agent_status(arguments.get("status"))
-            limit = validate_limit(arguments.get("limit"), max_val=1000)
-
-            result = await wazuh_client.get_agents(agent_id=agent_id, status=status, limit=limit)
-            _success = True
-            return {"content": [{"type": "text", "text": f"Wazuh Agents:\n{json.dumps(result, indent=2)}"}]}
-
-        elif tool_name == "get_wazuh_running_agents":
-            result = await wazuh_client.get_running_agents()
-            _success = True
-            return {"content": [{"type": "text", "text": f"Running Agents:\n{json.dumps(result, indent=2)}"}]}
-
-        elif tool_name == "check_agent_health":
-            agent_id = validate_agent_id(arguments.get("agent_id"), required=True)
-            result = await wazuh_client.check_agent_health(agent_id)
-            _success = True
-            return {"content": [{"type": "text", "text": f"Agent Health:\n{json.dumps(result, indent=2)}"}]}
-
-        elif tool_name == "get_agent_processes":
-            agent_id = validate_agent_id(arguments.get("agent_id"), required=True)
-            limit = validate_limit(arguments.get("limit"), max_val=1000)
-            result = await wazuh_client.get_agent_processes(agent_id, limit)
-            _success = True
-            return {"content": [{"type": "text", "text": f"Agent Processes:\n{json.dumps(result, indent=2)}"}]}
-
-        elif tool_name == "get_agent_ports":
-            agent_id = validate_agent_id(arguments.get("agent_id"), required=True)
-            limit = validate_limit(arguments.get("limit"), max_val=1000)
-            result = await wazuh_client.get_agent_ports(agent_id, limit)
-            _success = True
-            return {"content": [{"type": "text", "text": f"Agent Ports:\n{json.dumps(result, indent=2)}"}]}
-
-        elif tool_name == "get_agent_configuration":
-            agent_id = validate_agent_id(arguments.get("agent_id"), required=True)
-            result = await wazuh_client.get_agent_configuration(agent_id)
-            _success = True
-            return {"content": [{"type": "text", "text": f"Agent Configuration:\n{json.dumps(result, indent=2)}"}]}
-
-        # Vulnerability Management Tools
-        elif tool_name == "get_wazuh_vulnerabilities":
-            agent_id = validate_agent_id(arguments.get("agent_id"))
-            severity = validate_severity(arguments.get("severity"))
-            limit = validate_limit(arguments.get("limit"), max_val=500)
-            compact = validate_boolean(arguments.get("compact"), default=True, param_name="compact")
+        spec = _TOOL_DISPATCH.get(tool_name)
+        if spec is None:
+            raise ValueError(f"Unknown tool: {tool_name}. Use 'tools/list' to see available tools.")
 
-            result = await wazuh_client.get_vulnerabilities(agent_id=agent_id, severity=severity, limit=limit)
-            if compact:
-                result = _compact_vulns_result(result)
-            _success = True
-            return {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": f"Vulnerabilities:\n{json.dumps(result, indent=2 if not compact else None)}",
-                    }
-                ]
-            }
-
-        elif tool_name == "get_wazuh_critical_vulnerabilities":
-            limit = validate_limit(arguments.get("limit"), max_val=500, param_name="limit")
+        compact = False
+        if spec.compactor is not None:
             compact = validate_boolean(arguments.get("compact"), default=True, param_name="compact")
 
-            result = await wazuh_client.get_critical_vulnerabilities(limit)
-            if compact:
-                result = _compact_vulns_result(result)
-            _success = True
-            return {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": f"Critical Vulnerabilities:\n{json.dumps(result, indent=2 if not compact else None)}",
-                    }
-                ]
-            }
-
-        elif tool_name == "get_wazuh_vulnerability_summary":
-            time_range = validate_time_range(arguments.get("time_range"))
-            result = await wazuh_client.get_vulnerability_summary(time_range)
-            _success = True
-            return {"content": [{"type": "text", "text": f"Vulnerability Summary:\n{json.dumps(result, indent=2)}"}]}
-
-        # Security Analysis Tools
-        elif tool_name == "analyze_security_threat":
-            indicator_type = validate_indicator_type(arguments.get("indicator_type"))
-            indicator = validate_indicator(arguments.get("indicator"), indicator_type)
-
-            result = await wazuh_client.analyze_security_threat(indicator, indicator_type)
-            _success = True
-            return {"content": [{"type": "text", "text": f"Threat Analysis:\n{json.dumps(result, indent=2)}"}]}
-
-        elif tool_name == "check_ioc_reputation":
-            indicator_type = validate_indicator_type(arguments.get("indicator_type"))
-            indicator = validate_indicator(arguments.get("indicator"), indicator_type)
-
-            result = await wazuh_client.check_ioc_reputation(indicator, indicator_type)
-            _success = True
-            return {"content": [{"type": "text", "text": f"IoC Reputation:\n{json.dumps(result, indent=2)}"}]}
-
-        elif tool_name == "perform_risk_assessment":
-            agent_id = validate_agent_id(arguments.get("agent_id"))
-            result = await wazuh_client.perform_risk_assessment(agent_id)
-            _success = True
-            return {"content": [{"type": "text", "text": f"Risk Assessment:\n{json.dumps(result, indent=2)}"}]}
-
-        elif tool_name == "get_top_security_threats":
-            limit = validate_limit(arguments.get("limit"), min_val=1, max_val=50)
-            time_range = validate_time_range(arguments.get("time_range"))
-
-            result = await wazuh_client.get_top_security_threats(limit, time_range)
-            _success = True
-            return {"content": [{"type": "text", "text": f"Top Security Threats:\n{json.dumps(result, indent=2)}"}]}
-
-        elif tool_name == "generate_security_report":
-            report_type = validate_report_type(arguments.get("report_type"))
-            include_recommendations = validate_boolean(
-                arguments.get("include_recommendations"), default=True, param_name="include_recommendations"
-            )
-
-            result = await wazuh_client.generate_security_report(report_type, include_recommendations)
-            _success = True
-            return {"content": [{"type": "text", "text": f"Security Report:\n{json.dumps(result, indent=2)}"}]}
-
-        elif tool_name == "run_compliance_check":
-            framework = validate_compliance_framework(arguments.get("framework"))
-            agent_id = validate_agent_id(arguments.get("agent_id"))
-
-            result = await wazuh_client.run_compliance_check(framework, agent_id)
-            _success = True
-            return {"content": [{"type": "text", "text": f"Compliance Check:\n{json.dumps(result, indent=2)}"}]}
-
-        # System Monitoring Tools
-        elif tool_name == "get_wazuh_statistics":
-            result = await wazuh_client.get_wazuh_statistics()
-            _success = True
-            return {"content": [{"type": "text", "text": f"Wazuh Statistics:\n{json.dumps(result, indent=2)}"}]}
-
-        elif tool_name == "get_wazuh_weekly_stats":
-            result = await wazuh_client.get_weekly_stats()
-            _success = True
-            return {"content": [{"type": "text", "text": f"Weekly Statistics:\n{json.dumps(result, indent=2)}"}]}
-
-        elif tool_name == "get_wazuh_cluster_health":
-            result = await wazuh_client.get_cluster_health()
-            _success = True
-            return {"content": [{"type": "text", "text": f"Cluster Health:\n{json.dumps(result, indent=2)}"}]}
-
-        elif tool_name == "get_wazuh_cluster_nodes":
-            result = await wazuh_client.get_cluster_nodes()
-            _success = True
-            return {"content": [{"type": "text", "text": f"Cluster Nodes:\n{json.dumps(result, indent=2)}"}]}
-
-        elif tool_name == "get_wazuh_rules_summary":
-            result = await wazuh_client.get_rules_summary()
-            _success = True
-            return {"content": [{"type": "text", "text": f"Rules Summary:\n{json.dumps(result, indent=2)}"}]}
-
-        elif tool_name == "get_wazuh_remoted_stats":
-            result = await wazuh_client.get_remoted_stats()
-            _success = True
-            return {"content": [{"type": "text", "text": f"Remoted Statistics:\n{json.dumps(result, indent=2)}"}]}
-
-        elif tool_name == "get_wazuh_log_collector_stats":
-            result = await wazuh_client.get_log_collector_stats()
-            _success = True
-            return {"content": [{"type": "text", "text": f"Log Collector Statistics:\n{json.dumps(result, indent=2)}"}]}
-
-        elif tool_name == "search_wazuh_manager_logs":
-            query = validate_query(arguments.get("query"), required=True)
-            limit = validate_limit(arguments.get("limit"), max_val=1000)
-
-            result = await wazuh_client.search_manager_logs(query, limit)
-            _success = True
-            return {"content": [{"type": "text", "text": f"Manager Logs:\n{json.dumps(result, indent=2)}"}]}
-
-        elif tool_name == "get_wazuh_manager_error_logs":
-            limit = validate_limit(arguments.get("limit"), max_val=1000)
-            result = await wazuh_client.get_manager_error_logs(limit)
-            _success = True
-            return {"content": [{"type": "text", "text": f"Manager Error Logs:\n{json.dumps(result, indent=2)}"}]}
-
-        elif tool_name == "validate_wazuh_connection":
-            result = await wazuh_client.validate_connection()
-            _success = True
-            return {"content": [{"type": "text", "text": f"Connection Validation:\n{json.dumps(result, indent=2)}"}]}
-
-        else:
-            raise ValueError(f"Unknown tool: {tool_name}. Use 'tools/list' to see available tools.")
+        result = await spec.call(wazuh_client, arguments)
+        if compact:
+            result = await _compact_offloaded(spec.compactor, result)
+        _success = True
+        return {"content": [{"type": "text", "text": f"{spec.title}:\n{_dump_json(result, pretty=not compact)}"}]}
 
     except ToolValidationError as e:
         # Parameter validation errors - provide actionable guidance
@@ -1780,7 +1830,7 @@ async def handle_tools_call(params: Dict[str, Any], session: MCPSession) -> Dict
 
     finally:
         # Record tool execution metrics
-        _duration = _time.time() - _start_time
+        _duration = time.time() - _start_time
         record_tool_execution(tool_name, _duration, _success)
 
 
@@ -1836,7 +1886,7 @@ async def process_mcp_notification(method: str, params: Dict[str, Any], session:
         logger.debug(f"Received unknown notification: {method}")
 
 
-async def process_mcp_request(request: MCPRequest, session: MCPSession) -> MCPResponse:
+async def process_mcp_request(request: MCPRequest, session: MCPSession) -> Dict[str, Any]:
     """Process individual MCP request per JSON-RPC 2.0 specification."""
     try:
         # Check if method exists
@@ -1845,12 +1895,10 @@ async def process_mcp_request(request: MCPRequest, session: MCPSession) -> MCPRe
             if request.method in MCP_NOTIFICATIONS:
                 return create_error_response(
                     request.id,
-                    MCP_ERRORS["INVALID_REQUEST"],
+                    INVALID_REQUEST,
                     f"'{request.method}' is a notification, not a request method",
                 )
-            return create_error_response(
-                request.id, MCP_ERRORS["METHOD_NOT_FOUND"], f"Method '{request.method}' not found"
-            )
+            return create_error_response(request.id, METHOD_NOT_FOUND, f"Method '{request.method}' not found")
 
         # Execute method handler
         handler = MCP_METHODS[request.method]
@@ -1859,10 +1907,8 @@ async def process_mcp_request(request: MCPRequest, session: MCPSession) -> MCPRe
         return create_success_response(request.id, result)
 
     except ValueError as e:
-        return create_error_response(request.id, MCP_ERRORS["INVALID_PARAMS"], str(e))
+        return create_error_response(request.id, INVALID_PARAMS, str(e))
     except Exception as e:
-        from wazuh_mcp_server.monitoring import structured_logger
-
         structured_logger.error(
             f"Internal error processing {request.method}",
             exc_info=True,
@@ -1871,7 +1917,13 @@ async def process_mcp_request(request: MCPRequest, session: MCPSession) -> MCPRe
             error_type=type(e).__name__,
             error_message=str(e),
         )
-        return create_error_response(request.id, MCP_ERRORS["INTERNAL_ERROR"], "Internal server error")
+        return create_error_response(request.id, INTERNAL_ERROR, "Internal server error")
+
+
+def _sse_message(event_id: int, payload: Dict[str, Any]) -> bytes:
+    """Frame a JSON-RPC message as an SSE 'message' event, encoded straight to bytes."""
+    data = orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode()
+    return b"id: %d\nevent: message\ndata: %b\n\n" % (event_id, data)
 
 
 async def generate_sse_events(session: MCPSession, event_id_counter: int = 0):
@@ -1889,12 +1941,12 @@ async def generate_sse_events(session: MCPSession, event_id_counter: int = 0):
     # consisting of an event ID and an empty data field in order to prime
     # the client to reconnect (using that event ID as Last-Event-ID)"
     event_id += 1
-    yield f"id: {event_id}\nretry: 3000\ndata: \n\n"
+    yield b"id: %d\nretry: 3000\ndata: \n\n" % event_id
 
     # Send session info as a JSON-RPC notification
     event_id += 1
     session_notification = {"jsonrpc": "2.0", "method": "notifications/session", "params": session.to_dict()}
-    yield f"id: {event_id}\nevent: message\ndata: {json.dumps(session_notification)}\n\n"
+    yield _sse_message(event_id, session_notification)
 
     # Send capabilities notification
     event_id += 1
@@ -1903,7 +1955,7 @@ async def generate_sse_events(session: MCPSession, event_id_counter: int = 0):
         "method": "notifications/capabilities",
         "params": {"tools": True, "resources": True, "prompts": True, "logging": True},
     }
-    yield f"id: {event_id}\nevent: message\ndata: {json.dumps(capabilities_notification)}\n\n"
+    yield _sse_message(event_id, capabilities_notification)
 
     # Send periodic keepalive (ping) to maintain connection
     while True:
@@ -1913,7 +1965,7 @@ async def generate_sse_events(session: MCPSession, event_id_counter: int = 0):
             "method": "notifications/ping",
             "params": {"timestamp": datetime.now(timezone.utc).isoformat()},
         }
-        yield f"id: {event_id}\nevent: message\ndata: {json.dumps(ping_notification)}\n\n"
+        yield _sse_message(event_id, ping_notification)
         await asyncio.sleep(30)
 
 
@@ -1932,6 +1984,42 @@ def is_json_rpc_request(message: Dict[str, Any]) -> bool:
     return "method" in message and "id" in message
 
 
+async def process_mcp_batch(batch: List[Any], session: MCPSession) -> List[Dict[str, Any]]:
+    """
+    Process a JSON-RPC batch that contains at least one request.
+
+    Requests run concurrently and their responses keep batch order. Notifications
+    are applied in order once the requests have completed; client responses are ignored.
+    """
+    responses: List[Any] = []
+    notifications = []
+    for item in batch:
+        if isinstance(item, dict):
+            if is_json_rpc_notification(item):
+                notifications.append(item)
+                continue
+            if is_json_rpc_response(item):
+                continue
+        try:
+            responses.append(process_mcp_request(MCPRequest.from_dict(item), session))
+        except ValueError as e:
+            responses.append(
+                create_error_response(
+                    item.get("id") if isinstance(item, dict) else None,
+                    INVALID_REQUEST,
+                    f"Invalid request format: {e}",
+                )
+            )
+
+    pending = [i for i, response in enumerate(responses) if not isinstance(response, dict)]
+    for i, response in zip(pending, await asyncio.gather(*(responses[i] for i in pending))):
+        responses[i] = response
+
+    for item in notifications:
+        await process_mcp_notification(item.get("method", ""), item.get("params", {}), session)
+    return responses
+
+
 @app.get("/")
 @app.post("/")
 async def mcp_endpoint(
@@ -1971,7 +2059,7 @@ async def mcp_endpoint(
                 )
             session = existing_session
             session.update_activity()
-            await sessions.set(mcp_session_id, session)
+            await sessions.touch(session)
         else:
             session = await get_or_create_session(None, origin)
 
@@ -1991,7 +2079,7 @@ async def mcp_endpoint(
                 return response
             else:
                 # Return JSON response for non-SSE clients
-                return JSONResponse(
+                return MCPJSONResponse(
                     content={
                         "jsonrpc": "2.0",
                         "id": None,
@@ -2009,18 +2097,23 @@ async def mcp_endpoint(
             try:
                 body = await request.json()
             except json.JSONDecodeError:
-                return JSONResponse(
-                    content=create_error_response(None, MCP_ERRORS["PARSE_ERROR"], "Invalid JSON").dict(),
+                return MCPJSONResponse(
+                    content=create_error_response(None, PARSE_ERROR, "Invalid JSON"),
                     status_code=400,
                 )
 
             # Handle batch requests
             if isinstance(body, list):
                 if not body:
-                    return JSONResponse(
+                    return MCPJSONResponse(
+                        content=create_error_response(None, INVALID_REQUEST, "Empty batch request"),
+                        status_code=400,
+                    )
+                if len(body) > MAX_BATCH_SIZE:
+                    return MCPJSONResponse(
                         content=create_error_response(
-                            None, MCP_ERRORS["INVALID_REQUEST"], "Empty batch request"
-                        ).dict(),
+                            None, INVALID_REQUEST, f"Batch exceeds {MAX_BATCH_SIZE} messages"
+                        ),
                         status_code=400,
                     )
 
@@ -2045,31 +2138,8 @@ async def mcp_endpoint(
                     )
 
                 # Process batch containing requests
-                responses = []
-                for item in body:
-                    # Process notifications but don't add to responses
-                    if isinstance(item, dict) and is_json_rpc_notification(item):
-                        method = item.get("method", "")
-                        params = item.get("params", {})
-                        await process_mcp_notification(method, params, session)
-                        continue
-                    # Skip responses
-                    if isinstance(item, dict) and is_json_rpc_response(item):
-                        continue
-                    try:
-                        mcp_request = MCPRequest(**item)
-                        response = await process_mcp_request(mcp_request, session)
-                        responses.append(response.dict())
-                    except ValidationError as e:
-                        responses.append(
-                            create_error_response(
-                                item.get("id") if isinstance(item, dict) else None,
-                                MCP_ERRORS["INVALID_REQUEST"],
-                                f"Invalid request format: {e}",
-                            ).dict()
-                        )
-
-                return JSONResponse(
+                responses = await process_mcp_batch(body, session)
+                return MCPJSONResponse(
                     content=responses,
                     headers={"MCP-Session-Id": session.session_id, "Access-Control-Expose-Headers": "MCP-Session-Id"},
                 )
@@ -2104,22 +2174,22 @@ async def mcp_endpoint(
 
                 # Handle request
                 try:
-                    mcp_request = MCPRequest(**body)
+                    mcp_request = MCPRequest.from_dict(body)
                     response = await process_mcp_request(mcp_request, session)
-                    return JSONResponse(
-                        content=response.dict(),
+                    return MCPJSONResponse(
+                        content=response,
                         headers={
                             "MCP-Session-Id": session.session_id,
                             "Access-Control-Expose-Headers": "MCP-Session-Id",
                         },
                     )
-                except ValidationError as e:
-                    return JSONResponse(
+                except ValueError as e:
+                    return MCPJSONResponse(
                         content=create_error_response(
                             body.get("id") if isinstance(body, dict) else None,
-                            MCP_ERRORS["INVALID_REQUEST"],
+                            INVALID_REQUEST,
                             f"Invalid request format: {e}",
-                        ).dict(),
+                        ),
                         status_code=400,
                     )
 
@@ -2244,7 +2314,7 @@ async def mcp_streamable_http_endpoint(
                 )
             session = existing_session
             session.update_activity()
-            await sessions.set(mcp_session_id, session)
+            await sessions.touch(session)
         else:
             # Create new session only if no session ID provided
             session = await get_or_create_session(None, origin)
@@ -2280,8 +2350,8 @@ async def mcp_streamable_http_endpoint(
             try:
                 body = await request.json()
             except json.JSONDecodeError:
-                return JSONResponse(
-                    content=create_error_response(None, MCP_ERRORS["PARSE_ERROR"], "Invalid JSON").dict(),
+                return MCPJSONResponse(
+                    content=create_error_response(None, PARSE_ERROR, "Invalid JSON"),
                     status_code=400,
                     headers=response_headers,
                 )
@@ -2289,10 +2359,16 @@ async def mcp_streamable_http_endpoint(
             # Handle batch messages per MCP Streamable HTTP spec
             if isinstance(body, list):
                 if not body:
-                    return JSONResponse(
+                    return MCPJSONResponse(
+                        content=create_error_response(None, INVALID_REQUEST, "Empty batch request"),
+                        status_code=400,
+                        headers=response_headers,
+                    )
+                if len(body) > MAX_BATCH_SIZE:
+                    return MCPJSONResponse(
                         content=create_error_response(
-                            None, MCP_ERRORS["INVALID_REQUEST"], "Empty batch request"
-                        ).dict(),
+                            None, INVALID_REQUEST, f"Batch exceeds {MAX_BATCH_SIZE} messages"
+                        ),
                         status_code=400,
                         headers=response_headers,
                     )
@@ -2310,31 +2386,8 @@ async def mcp_streamable_http_endpoint(
                     return Response(status_code=202, headers=response_headers)
 
                 # Process requests in batch
-                responses = []
-                for item in body:
-                    # Process notifications but don't add to responses
-                    if isinstance(item, dict) and is_json_rpc_notification(item):
-                        method = item.get("method", "")
-                        params = item.get("params", {})
-                        await process_mcp_notification(method, params, session)
-                        continue
-                    # Skip responses
-                    if isinstance(item, dict) and is_json_rpc_response(item):
-                        continue
-                    try:
-                        mcp_request = MCPRequest(**item)
-                        resp = await process_mcp_request(mcp_request, session)
-                        responses.append(resp.dict())
-                    except ValidationError as e:
-                        responses.append(
-                            create_error_response(
-                                item.get("id") if isinstance(item, dict) else None,
-                                MCP_ERRORS["INVALID_REQUEST"],
-                                f"Invalid request format: {e}",
-                            ).dict()
-                        )
-
-                return JSONResponse(content=responses, headers=response_headers)
+                responses = await process_mcp_batch(body, session)
+                return MCPJSONResponse(content=responses, headers=response_headers)
 
             # Handle single message
             if isinstance(body, dict):
@@ -2352,12 +2405,10 @@ async def mcp_streamable_http_endpoint(
 
             # Validate JSON-RPC request
             try:
-                mcp_request = MCPRequest(**body) if isinstance(body, dict) else None
-            except ValidationError as e:
-                return JSONResponse(
-                    content=create_error_response(
-                        None, MCP_ERRORS["INVALID_REQUEST"], f"Invalid MCP request: {str(e)}"
-                    ).dict(),
+                mcp_request = MCPRequest.from_dict(body) if isinstance(body, dict) else None
+            except ValueError as e:
+                return MCPJSONResponse(
+                    content=create_error_response(None, INVALID_REQUEST, f"Invalid MCP request: {str(e)}"),
                     status_code=400,
                     headers=response_headers,
                 )
@@ -2371,13 +2422,13 @@ async def mcp_streamable_http_endpoint(
                 if accept and "text/event-stream" in accept:
                     # Optional: Stream the response via SSE for long operations
                     # For now, return JSON response
-                    return JSONResponse(content=mcp_response.dict(), headers=response_headers)
+                    return MCPJSONResponse(content=mcp_response, headers=response_headers)
                 else:
                     # Standard JSON response
-                    return JSONResponse(content=mcp_response.dict(), headers=response_headers)
+                    return MCPJSONResponse(content=mcp_response, headers=response_headers)
             else:
-                return JSONResponse(
-                    content=create_error_response(None, MCP_ERRORS["INVALID_REQUEST"], "Invalid request format").dict(),
+                return MCPJSONResponse(
+                    content=create_error_response(None, INVALID_REQUEST, "Invalid request format"),
                     status_code=400,
                     headers=response_headers,
                 )
@@ -2553,14 +2604,10 @@ async def get_auth_token(request: Request):
 
         if configured_key:
             # Use constant-time comparison to prevent timing attacks
-            import hmac
-
             if not hmac.compare_digest(api_key, configured_key):
                 raise HTTPException(status_code=401, detail="Invalid API key")
         else:
             # Fall back to auth_manager validation
-            from wazuh_mcp_server.auth import auth_manager
-
             if not auth_manager.validate_api_key(api_key):
                 raise HTTPException(status_code=401, detail="Invalid API key")
 
@@ -4,11 +4,13 @@ Session storage backends for serverless-ready architecture
 Provides pluggable session storage with in-memory and Redis implementations
 """
 
+import asyncio
 import json
 import logging
 import os
+import time
 from abc import ABC, abstractmethod
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Any, Dict, Optional
 
 logger = logging.getLogger(__name__)
@@ -27,6 +29,11 @@ class SessionStore(ABC):
         """Store session data."""
         pass
 
+    @abstractmethod
+    async def touch(self, session_id: str, last_activity: float) -> bool:
+        """Refresh a session's activity (epoch seconds) and expiry without rewriting its data."""
+        pass
+
     @abstractmethod
     async def delete(self, session_id: str) -> bool:
         """Delete session by ID."""
@@ -56,12 +63,14 @@ class SessionStore(ABC):
 class InMemorySessionStore(SessionStore):
     """
     In-memory session storage (default, current behavior).
-    Thread-safe for single-instance deployments.
+    Single-key operations rely on dict atomicity and take no lock; only the
+    multi-key expiry sweep is serialized.
     NOT suitable for serverless/multi-instance deployments.
     """
 
     def __init__(self):
         self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._cleanup_lock = asyncio.Lock()
         logger.info("Initialized InMemorySessionStore (single-instance mode)")
 
     async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
@@ -77,6 +86,14 @@ class InMemorySessionStore(SessionStore):
             logger.error(f"Failed to store session {session_id}: {e}")
             return False
 
+    async def touch(self, session_id: str, last_activity: float) -> bool:
+        """Update last_activity in place."""
+        session_data = self._sessions.get(session_id)
+        if session_data is None:
+            return False
+        session_data["last_activity"] = last_activity
+        return True
+
     async def delete(self, session_id: str) -> bool:
         """Delete session by ID."""
         try:
@@ -107,21 +124,28 @@ class InMemorySessionStore(SessionStore):
 
     async def cleanup_expired(self, timeout_minutes: int = 30) -> int:
         """Remove expired sessions and return count."""
-        from datetime import timedelta
+        # A sweep already in progress covers this call
+        if self._cleanup_lock.locked():
+            return 0
+        async with self._cleanup_lock:
+            return await self._cleanup_expired(timeout_minutes)
 
+    async def _cleanup_expired(self, timeout_minutes: int) -> int:
         expired_count = 0
-        now = datetime.now(timezone.utc)
+        cutoff = time.time() - timeout_minutes * 60
 
         expired_ids = []
         for session_id, session_data in self._sessions.items():
-            last_activity_str = session_data.get("last_activity")
-            if last_activity_str:
+            last_activity = session_data.get("last_activity")
+            if isinstance(last_activity, str):
+                # ISO strings predate epoch-second storage
                 try:
-                    last_activity = datetime.fromisoformat(last_activity_str.replace("Z", "+00:00"))
-                    if now - last_activity > timedelta(minutes=timeout_minutes):
-                        expired_ids.append(session_id)
-                except Exception as e:
+                    last_activity = datetime.fromisoformat(last_activity.replace("Z", "+00:00")).timestamp()
+                except ValueError as e:
                     logger.error(f"Error parsing last_activity for session {session_id}: {e}")
+                    continue
+            if last_activity and last_activity < cutoff:
+                expired_ids.append(session_id)
 
         for session_id in expired_ids:
             if await self.delete(session_id):
@@ -180,14 +204,29 @@ class RedisSessionStore(SessionStore):
         """Generate Redis key for session."""
         return f"mcp:session:{session_id}"
 
+    def _activity_key(self, session_id: str) -> str:
+        """Generate Redis key for a session's last activity (outside the mcp:session:* namespace)."""
+        return f"mcp:session_activity:{session_id}"
+
+    @staticmethod
+    def _with_activity(session_data: Dict[str, Any], activity: Optional[str]) -> Dict[str, Any]:
+        """Overlay the separately touched last_activity onto a stored session record."""
+        if activity is not None:
+            activity = float(activity)
+            stored = session_data.get("last_activity")
+            # Records written before epoch-second storage hold ISO strings; touches are always newer
+            if not isinstance(stored, (int, float)) or activity > stored:
+                session_data["last_activity"] = activity
+        return session_data
+
     async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get session data by ID."""
         await self._ensure_initialized()
 
         try:
-            data = await self._redis.get(self._session_key(session_id))
+            data, activity = await self._redis.mget(self._session_key(session_id), self._activity_key(session_id))
             if data:
-                return json.loads(data)
+                return self._with_activity(json.loads(data), activity)
             return None
         except Exception as e:
             logger.error(f"Failed to get session {session_id} from Redis: {e}")
@@ -206,12 +245,30 @@ class RedisSessionStore(SessionStore):
             logger.error(f"Failed to store session {session_id} in Redis: {e}")
             return False
 
+    async def touch(self, session_id: str, last_activity: float) -> bool:
+        """Extend the session TTL and record last_activity in its own key, leaving the payload as is."""
+        await self._ensure_initialized()
+
+        try:
+            activity_key = self._activity_key(session_id)
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.expire(self._session_key(session_id), self.ttl_seconds)
+                pipe.set(activity_key, last_activity, ex=self.ttl_seconds)
+                alive, _ = await pipe.execute()
+            if not alive:
+                # Session already gone; don't leave an orphaned activity key behind
+                await self._redis.delete(activity_key)
+            return bool(alive)
+        except Exception as e:
+            logger.error(f"Failed to touch session {session_id} in Redis: {e}")
+            return False
+
     async def delete(self, session_id: str) -> bool:
         """Delete session by ID."""
         await self._ensure_initialized()
 
         try:
-            result = await self._redis.delete(self._session_key(session_id))
+            result = await self._redis.delete(self._session_key(session_id), self._activity_key(session_id))
             return result > 0
         except Exception as e:
             logger.error(f"Failed to delete session {session_id} from Redis: {e}")
@@ -239,9 +296,9 @@ class RedisSessionStore(SessionStore):
             sessions = {}
             for key in keys:
                 session_id = key.split(":")[-1]
-                data = await self._redis.get(key)
+                data, activity = await self._redis.mget(key, self._activity_key(session_id))
                 if data:
-                    sessions[session_id] = json.loads(data)
+                    sessions[session_id] = self._with_activity(json.loads(data), activity)
 
             return sessions
         except Exception as e:
@@ -253,11 +310,11 @@ class RedisSessionStore(SessionStore):
         await self._ensure_initialized()
 
         try:
-            pattern = self._session_key("*")
-            keys = await self._redis.keys(pattern)
+            keys = await self._redis.keys(self._session_key("*"))
+            activity_keys = await self._redis.keys(self._activity_key("*"))
 
-            if keys:
-                await self._redis.delete(*keys)
+            if keys or activity_keys:
+                await self._redis.delete(*keys, *activity_keys)
                 logger.info(f"Cleared {len(keys)} sessions from Redis")
 
             return True
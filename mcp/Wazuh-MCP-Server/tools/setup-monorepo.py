@@ -220,7 +220,7 @@ dependencies = [
     "fastapi>=0.115.0",
     "uvicorn[standard]>=0.32.0",
     "prometheus-client>=0.20.0",
-    "python-jose[cryptography]>=3.3.0",
+    "PyJWT>=2.10.0",
     "passlib[bcrypt]>=1.7.4",
 ]
 